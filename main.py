@@ -1,11 +1,11 @@
 # main.py
+import os
 from pathlib import Path
 from tqdm import tqdm
-import yaml
 import logging
 from src.pipeline_orchestrator import PipelineOrchestrator
 from src.utils.config_loader import load_config
-from src.model_loader import SILERO_MODEL, SILERO_UTILS
+from src.model_loader import get_silero_model
 # Import all our services
 from src.services.vad_service import VADService
 from src.services.split_point_service import SplitPointService
@@ -23,17 +23,40 @@ from src.services.audio_editor_service import AudioEditorService
 from src.services.dataset_generator_service import DatasetGeneratorService
 # --- MODIFICATION END ---
 
+AUDIO_EXTENSIONS = ('.wav', '.mp3')
+
+
+def iter_audio_files(root: Path):
+    """Recursively yields audio files under `root`, filtering on the name without extra stat calls."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_audio_files(entry.path)
+            elif os.path.splitext(entry.name)[1].lower() in AUDIO_EXTENSIONS:
+                yield Path(entry.path)
+
 
 def main():
     """Main function to build the services, orchestrator, and run the pipeline."""
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
     config = load_config()
+
+    base_dir = Path(__file__).parent
+    input_dir = base_dir / 'audio_inputs'
+    audio_files = list(iter_audio_files(input_dir)) if input_dir.is_dir() else []
+
+    if not audio_files:
+        logging.info(f"\nNo audio files found in '{input_dir}'.")
+        return
+
+    # The VAD model is only loaded once we know there is work to do.
+    silero_model, silero_utils = get_silero_model(num_threads=config.get('vad_num_threads'))
     logging.info("Configuration and models loaded.")
 
     # Build all specialist services
     services = {
-        'vad': VADService(model=SILERO_MODEL, utils=SILERO_UTILS),
+        'vad': VADService(model=silero_model, utils=silero_utils),
         'split_point': SplitPointService(),
         'transcription_chunker': TranscriptionChunkerService(),
         'audio_splitter': AudioSplitterService(),
@@ -53,21 +76,17 @@ def main():
 
     orchestrator = PipelineOrchestrator(services=services, config=config)
 
-    base_dir = Path(__file__).parent
-    input_dir = base_dir / 'audio_inputs'
-    audio_files = [p for p in input_dir.glob('**/*') if p.suffix.lower() in ['.wav', '.mp3']]
-
-    if not audio_files:
-        logging.info(f"\nNo audio files found in '{input_dir}'.")
-        return
-
     logging.info(f"\nFound {len(audio_files)} audio file(s) to process.")
-    
-    for audio_path in tqdm(audio_files, desc="Processing audio files"):
-        try:
-            orchestrator.run(audio_path=audio_path)
-        except Exception as e:
-            logging.error(f"\n❌ An unhandled error occurred for {audio_path.name}: {e}", exc_info=True)
+
+    # Files flow through the stages as a pipeline, so while one file waits on the
+    # network (Scribe, LLM) another can be running VAD or the MFA subprocess.
+    # Per-file errors are logged by the orchestrator and don't stop the batch.
+    # The open tar shard and manifest are finalized even if the batch is interrupted.
+    try:
+        with tqdm(total=len(audio_files), desc="Processing audio files") as progress:
+            orchestrator.run_batch(audio_files, on_file_done=lambda _: progress.update(1))
+    finally:
+        services['dataset_generator'].close()
 
     logging.info("\n--- All files processed. ---")
 
@@ -1,18 +1,60 @@
 # src/model_loader.py
-import torch
+import logging
+import os
 
-def load_silero_model():
+_SILERO_MODEL = None
+_SILERO_UTILS = None
+
+def _configure_onnx_session(model, num_threads: int = None):
+    """
+    Applies `num_threads` (the `vad_num_threads` config value) as the intra-op thread
+    count of the ONNX Runtime session inside Silero's wrapper. Silero already creates
+    the session with one thread and ORT's default optimizations, so the session is
+    only rebuilt when a different count is asked for, keeping its other options and
+    execution providers.
+
+    ORT keeps the model source only in private attributes of the session; if an
+    upgrade changes them, the existing session is kept and a warning is logged.
+    """
+    session = getattr(model, 'session', None)
+    if not num_threads or session is None:
+        return
+    opts = session.get_session_options()
+    if opts.intra_op_num_threads == num_threads:
+        return
+
+    import onnxruntime as ort
+
+    model_source = getattr(session, '_model_path', None) or getattr(session, '_model_bytes', None)
+    if not isinstance(model_source, (str, bytes, os.PathLike)):
+        logging.warning(f"Silero's ONNX session does not expose its model source; ignoring vad_num_threads={num_threads}.")
+        return
+    opts.intra_op_num_threads = num_threads
+    try:
+        model.session = ort.InferenceSession(model_source, sess_options=opts, providers=session.get_providers())
+    except Exception as e:
+        logging.warning(f"Could not rebuild Silero's ONNX session ({e}); ignoring vad_num_threads={num_threads}.")
+
+def load_silero_model(num_threads: int = None):
     """Loads the Silero VAD model and utils from torch.hub."""
+    # torch is imported here so that importing this module stays cheap.
+    import torch
+
     print("Initializing Silero VAD model... (This should only happen once)")
     try:
         model, utils = torch.hub.load(repo_or_dir='snakers4/silero-vad',
                                       model='silero_vad',
                                       force_reload=False,
                                       onnx=True)
+        _configure_onnx_session(model, num_threads)
         return model, utils
     except Exception as e:
         print(f"Fatal: Error loading Silero VAD model: {e}")
         raise
 
-# Load the model once when this module is first imported
-SILERO_MODEL, SILERO_UTILS = load_silero_model()
+def get_silero_model(num_threads: int = None):
+    """Returns the Silero VAD model and utils, loading them on first use."""
+    global _SILERO_MODEL, _SILERO_UTILS
+    if _SILERO_MODEL is None:
+        _SILERO_MODEL, _SILERO_UTILS = load_silero_model(num_threads)
+    return _SILERO_MODEL, _SILERO_UTILS
@@ -2,6 +2,7 @@
 from pathlib import Path
 import pandas as pd
 from .vad_processor import process_audio
+from .utils.dataframe_io import read_dataframe, write_dataframe
 
 def run_vad_pipeline(
     audio_path: Path, 
@@ -22,7 +23,8 @@ def run_vad_pipeline(
         cache_dir (Path): Directory where cached results are stored.
         model: The loaded Silero VAD ONNX model.
         get_speech_timestamps: The function from Silero utils to get timestamps.
-        vad_suffix (str): The suffix for the VAD output filename.
+        vad_suffix (str): The suffix for the VAD output filename. A '.parquet'
+            suffix stores the cache as Parquet, anything else as CSV.
 
     Returns:
         pd.DataFrame: A DataFrame with 'start_ms' and 'end_ms' columns.
@@ -34,8 +36,8 @@ def run_vad_pipeline(
     # --- Caching Logic ---
     if cache_path.exists():
         print(f"✅ Found cached VAD file. Loading from: {cache_path}")
-        # Load the DataFrame from the cached CSV file
-        timestamps_df = pd.read_csv(cache_path)
+        # Load the DataFrame from the cached file
+        timestamps_df = read_dataframe(cache_path)
         return timestamps_df
     
     # --- Processing Logic (if not cached) ---
@@ -50,11 +52,11 @@ def run_vad_pipeline(
 
     # Save the new result to the cache for future runs
     if not timestamps_df.empty:
-        timestamps_df.to_csv(cache_path, index=False)
+        write_dataframe(cache_path, timestamps_df)
         print(f"✅ Success! VAD timestamps saved to cache: {cache_path}")
     else:
         # Still save an empty file to cache the fact that no speech was detected
-        timestamps_df.to_csv(cache_path, index=False)
+        write_dataframe(cache_path, timestamps_df)
         print("✅ Success! (No speech was detected, result cached).")
 
     return timestamps_df
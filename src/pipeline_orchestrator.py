@@ -2,14 +2,86 @@
 from pathlib import Path
 import pandas as pd
 import json
+import orjson
+import msgpack
 from pydub import AudioSegment
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List
 import shutil
 import logging
-import librosa
+import os
+import tempfile
+import functools
+import glob
+import queue
+import threading
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+import soundfile as sf
 
 from src.utils.mfa_text_normalizer import normalize_text_for_mfa
+from src.utils.dataframe_io import read_dataframe, write_dataframe
+from src.services.audio_splitter_service import MFA_SAMPLE_RATE
+from src.vad_processor import VAD_OUTPUT_VERSION
+
+# Parsed cache files are memoized on (path, mtime) so repeated runs in the same
+# process don't re-parse them, while a rewritten file is still picked up.
+# Callers must treat the returned objects as read-only.
+@functools.lru_cache(maxsize=256)
+def _load_cached_df(path: str, mtime: float, columns: tuple = None) -> pd.DataFrame:
+    return read_dataframe(path, columns=list(columns) if columns else None)
+
+@functools.lru_cache(maxsize=256)
+def _load_cached_json(path: str, mtime: float) -> Any:
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+@functools.lru_cache(maxsize=256)
+def _load_cached_msgpack(path: str, mtime: float) -> Any:
+    with open(path, 'rb') as f:
+        return msgpack.unpackb(f.read(), raw=False)
+
+def _msgpack_default(obj: Any) -> Any:
+    # NumPy scalars leak into the transcripts from DataFrame arithmetic.
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Cannot serialize {type(obj).__name__} to msgpack")
+
+# Cache keys sample the head and tail of the source file (plus its size) rather than
+# hashing the whole thing, which keeps keying cheap even for multi-GB recordings.
+_FINGERPRINT_SAMPLE_BYTES = 64 * 1024
+_STAGE_KEY_LEN = 16
+
+@functools.lru_cache(maxsize=256)
+def _audio_fingerprint(path: str, size: int, mtime: float) -> bytes:
+    h = hashlib.blake2b(str(size).encode())
+    with open(path, 'rb') as f:
+        h.update(f.read(_FINGERPRINT_SAMPLE_BYTES))
+        if size > 2 * _FINGERPRINT_SAMPLE_BYTES:
+            f.seek(size - _FINGERPRINT_SAMPLE_BYTES)
+        h.update(f.read())
+    return h.digest()
+
+def _load_pcm16(path: Path):
+    """
+    Decodes the source audio once into an int16 array shaped (frames, channels) and
+    returns it with its sample rate. libsndfile handles WAV/FLAC/OGG (and MP3 on
+    recent builds) without spawning ffmpeg; anything else goes through pydub.
+    """
+    try:
+        return sf.read(str(path), dtype='int16', always_2d=True)
+    except RuntimeError:
+        pass
+    audio = AudioSegment.from_file(path)
+    if audio.sample_width != 2:
+        # Every chunk is written as PCM_16, so other widths are converted to 16-bit once
+        # up front. pydub keeps 8-bit audio signed and handles 24-bit packing here.
+        audio = audio.set_sample_width(2)
+    return np.frombuffer(audio.raw_data, dtype='<i2').reshape(-1, audio.channels), audio.frame_rate
+
+# Queue sentinel that tells a stage worker to exit.
+_STOP = object()
 
 class PipelineOrchestrator:
     # __init__ and _get_cache_path are unchanged...
@@ -18,18 +90,33 @@ class PipelineOrchestrator:
         self.services = services
         self.config = config
         self.use_cache = self.config.get('use_cache', False)
+        # 'msgpack' stores the internal object caches (per-chunk Scribe results and the
+        # MFA alignment) in a compact binary format; 'json' keeps them human-readable.
+        self.cache_format = self.config.get('cache_format', 'json')
         base_dir = Path(__file__).parent.parent
         self.cache_root = base_dir / 'cache'
         self.cache_root.mkdir(exist_ok=True)
+        # Resolve and create every stage cache directory once, instead of on every lookup.
+        self._stage_dirs: Dict[str, Path] = {
+            name: self.cache_root.parent / rel_path
+            for name, rel_path in self.config.get('cache_paths', {}).items()
+        }
+        for stage_dir in self._stage_dirs.values():
+            stage_dir.mkdir(exist_ok=True, parents=True)
+        # How each cached stage result is read from and written to disk.
+        self._stage_io = {
+            'vad': (self._load_df, self._save_df),
+            'split_points': (functools.partial(self._load_df, columns=self._split_point_columns()), self._save_df),
+            'scribe': (self._load_json, self._save_json),
+            'mfa': (self._load_obj, self._save_obj),
+            'llm': (self._load_text, self._save_text),
+        }
 
-    def _get_cache_path(self, stage_name: str, source_path: Path, suffix_override: str = None) -> Path:
+    def _get_cache_path(self, stage_name: str, source_path: Path, suffix_override: str = None, key_extra: str = '') -> Path:
         try:
-            stage_cache_dir_str = self.config['cache_paths'][stage_name]
+            stage_cache_dir = self._stage_dirs[stage_name]
         except KeyError:
             raise KeyError(f"Error: The key '{stage_name}' was not found in the 'cache_paths' section of your config.yaml.")
-        
-        stage_cache_dir = self.cache_root.parent / stage_cache_dir_str
-        stage_cache_dir.mkdir(exist_ok=True, parents=True)
 
         if suffix_override:
             return stage_cache_dir / (source_path.stem + suffix_override)
@@ -50,151 +137,347 @@ class PipelineOrchestrator:
             suffix = self.config['output_files'][suffix_key]
         except KeyError:
             raise KeyError(f"Error: The key '{suffix_key}' was not found in the 'output_files' section of your config.yaml.")
+
+        # The VAD and split-point caches are small numeric tables, so they are always
+        # stored as memory-mapped Feather files regardless of the configured extension.
+        if stage_name in ('vad', 'split_points'):
+            suffix = os.path.splitext(suffix)[0] + '.feather'
+        elif stage_name == 'mfa':
+            suffix = os.path.splitext(suffix)[0] + self._obj_cache_ext
         
-        return stage_cache_dir / (source_path.stem + suffix)
+        return stage_cache_dir / f"{source_path.stem}.{self._stage_key(stage_name, source_path, key_extra)}{suffix}"
+
+    def _stage_key(self, stage_name: str, source_path: Path, key_extra: str = '') -> str:
+        """
+        Content-addressed key for a stage's cache entry: a hash of the sampled source
+        audio, the stage name and that stage's section of the config. `_cached` looks
+        entries up by this key alone, so renamed files reuse their caches, while changed
+        settings miss them. `key_extra` folds in any other input the stage's result
+        depends on.
+
+        Only the size and the first and last 64 KiB of the audio are hashed, so an edit
+        that keeps the file size and leaves both ends untouched is not detected; delete
+        the file's cache entries after such an edit.
+        """
+        st = os.stat(source_path)
+        h = hashlib.blake2b(_audio_fingerprint(str(source_path), st.st_size, st.st_mtime), digest_size=_STAGE_KEY_LEN // 2)
+        h.update(stage_name.encode())
+        h.update(json.dumps(self.config.get(stage_name), sort_keys=True, default=str).encode())
+        h.update(key_extra.encode('utf-8'))
+        return h.hexdigest()
+
+    def _find_entry_by_key(self, cache_path: Path, source_path: Path) -> Path:
+        """
+        Returns an existing entry with the same key and suffix as `cache_path` under any
+        stem (e.g. the file's name before a rename), or None.
+        """
+        key_and_suffix = cache_path.name[len(source_path.stem) + 1:]
+        return next(cache_path.parent.glob('*.' + glob.escape(key_and_suffix)), None)
+
+    def _prune_stale_entries(self, cache_path: Path, source_path: Path):
+        """Deletes cache entries for the same source stem whose key no longer matches."""
+        stem = source_path.stem
+        suffix = cache_path.name[len(stem) + 1 + _STAGE_KEY_LEN:]
+        pattern = re.compile(re.escape(stem) + r'\.[0-9a-f]{%d}' % _STAGE_KEY_LEN + re.escape(suffix))
+        for sibling in cache_path.parent.iterdir():
+            if sibling != cache_path and pattern.fullmatch(sibling.name):
+                sibling.unlink(missing_ok=True)
+
+    def _cached(self, stage_name: str, source_path: Path, producer: Callable[[], Any], key_extra: str = '') -> Any:
+        """
+        Returns a stage's result from its cache entry when caching is enabled and the
+        entry exists; otherwise calls `producer()` and caches what it returns.
+        """
+        load, save = self._stage_io[stage_name]
+        cache_path = self._get_cache_path(stage_name, source_path, key_extra=key_extra)
+        if self.use_cache:
+            entry = cache_path if cache_path.exists() else self._find_entry_by_key(cache_path, source_path)
+            if entry is not None:
+                return load(entry)
+        result = producer()
+        if self.use_cache:
+            save(cache_path, result)
+            self._prune_stale_entries(cache_path, source_path)
+        return result
+
+
+    def _load_json(self, path: Path) -> Any:
+        """Loads a JSON cache file through the in-memory memoization layer."""
+        return _load_cached_json(str(path), os.path.getmtime(path))
+
+    def _load_df(self, path: Path, columns: List[str] = None) -> pd.DataFrame:
+        """Loads a DataFrame cache file (optionally only `columns`) through the in-memory memoization layer."""
+        return _load_cached_df(str(path), os.path.getmtime(path), tuple(columns) if columns else None)
+
+    def _split_point_columns(self) -> List[str]:
+        """
+        The split-point columns the downstream services actually read, or None (all
+        columns) if any of them doesn't declare SPLIT_POINT_COLUMNS.
+        """
+        columns = set()
+        for name in ('transcription_chunker', 'mfa_chunker', 'audio_editor'):
+            needed = getattr(self.services.get(name), 'SPLIT_POINT_COLUMNS', None)
+            if needed is None:
+                return None
+            columns.update(needed)
+        return sorted(columns)
+
+    def _save_json(self, path: Path, obj: Any):
+        """Serializes `obj` in memory and writes it to the cache with a single write call."""
+        # orjson emits UTF-8 bytes directly; OPT_SERIALIZE_NUMPY covers the NumPy scalars
+        # that leak into the transcripts from DataFrame arithmetic.
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+
+    @property
+    def _obj_cache_ext(self) -> str:
+        return '.msgpack' if self.cache_format == 'msgpack' else '.json'
+
+    def _load_obj(self, path: Path) -> Any:
+        """Loads an internal object cache, as msgpack or JSON depending on its extension."""
+        if path.suffix == '.msgpack':
+            return _load_cached_msgpack(str(path), os.path.getmtime(path))
+        return self._load_json(path)
+
+    def _save_obj(self, path: Path, obj: Any):
+        if path.suffix == '.msgpack':
+            path.write_bytes(msgpack.packb(obj, use_bin_type=True, default=_msgpack_default))
+        else:
+            self._save_json(path, obj)
+
+    def _load_text(self, path: Path) -> str:
+        return path.read_text(encoding='utf-8')
+
+    def _save_text(self, path: Path, text: str):
+        path.write_bytes(text.encode('utf-8'))
+
+    def _save_df(self, path: Path, df: pd.DataFrame):
+        """Writes a DataFrame cache in the format implied by the path's extension (Feather for VAD/split points)."""
+        write_dataframe(path, df)
+
+    def _transcribe_chunk(self, chunk_path: Path, scribe_cache_dir: Path, stage_key: str) -> Dict[str, Any]:
+        """Transcribes a single audio chunk with Scribe, using the per-chunk JSON cache."""
+        scribe_chunk_cache_file = scribe_cache_dir / f"{chunk_path.stem}.{stage_key}{self._obj_cache_ext}"
+        if self.use_cache and scribe_chunk_cache_file.exists():
+            return self._load_obj(scribe_chunk_cache_file)
+        result = self.services['scribe'].run(chunk_path)
+        if self.use_cache:
+            self._save_obj(scribe_chunk_cache_file, result)
+        return result
+
+    def _transcribe(self, audio_path: Path, audio_np: np.ndarray, audio_sr: int, split_points_df: pd.DataFrame) -> Dict[str, Any]:
+        """Splits the audio into transcription chunks, runs Scribe on each and merges the results."""
+        transcription_chunks_df = self.services['transcription_chunker'].run(split_points_df)
+        splitter_df = transcription_chunks_df.rename(columns={'chunk_start_ms': 'start_ms', 'chunk_end_ms': 'end_ms'})
+        chunks_dir = self._stage_dirs['audio_chunks']
+        chunk_paths = self.services['audio_splitter'].run(audio_np, audio_sr, splitter_df, chunks_dir, audio_path.stem)
+        scribe_cache_dir = self._stage_dirs['scribe']
+        stage_key = self._stage_key('scribe', audio_path)
+        # Scribe calls are network-bound, so transcribe the chunks concurrently.
+        # pool.map keeps the results in chunk order for the normalizer.
+        scribe_concurrency = self.config.get('scribe_concurrency', 8)
+        with ThreadPoolExecutor(max_workers=scribe_concurrency) as pool:
+            raw_scribe_results = list(pool.map(
+                lambda chunk_path: self._transcribe_chunk(chunk_path, scribe_cache_dir, stage_key), chunk_paths
+            ))
+        return self.services['scribe_normalizer'].run(raw_scribe_results, transcription_chunks_df)
+
+    def _select_chunks_for_cuts(self, mfa_chunks: List[Dict[str, Any]], cut_segments: List[List[int]]) -> List[Dict[str, Any]]:
+        """
+        Keeps the MFA chunks that contain a cut word, plus one chunk on either side: the
+        editor reads the words adjacent to each cut from the MFA data, and those can sit
+        across a chunk boundary. Returns all chunks if no cut word falls in any chunk.
+        """
+        cut_ids = {word_id for segment in cut_segments for word_id in segment}
+        hits = [i for i, chunk in enumerate(mfa_chunks) if any(w['id'] in cut_ids for w in chunk['scribe_words'])]
+        keep = sorted({j for i in hits for j in (i - 1, i, i + 1) if 0 <= j < len(mfa_chunks)})
+        if not keep:
+            return mfa_chunks
+        logging.info(f"Aligning {len(keep)} of {len(mfa_chunks)} MFA chunks around {len(cut_segments)} cut(s).")
+        return [mfa_chunks[j] for j in keep]
+
+    def _mfa_temp_root(self, workspace_bytes: int) -> Path:
+        """
+        Returns the directory MFA workspaces are created under: `mfa_temp_root` when it is
+        configured (e.g. /dev/shm, to keep the corpus in RAM) and currently has room for
+        `workspace_bytes`, otherwise cache/mfa_temp. tmpfs is small in containers (Docker
+        gives /dev/shm 64 MB), so it is checked for every file rather than assumed.
+        """
+        configured = self.config.get('mfa_temp_root')
+        if configured:
+            root = Path(configured)
+            if root.is_dir() and shutil.disk_usage(root).free >= workspace_bytes:
+                return root
+            logging.warning(f"mfa_temp_root '{root}' is missing or has less than {workspace_bytes / 1e6:.0f} MB free; "
+                            f"using the cache directory for the MFA workspace.")
+        root = self.cache_root / 'mfa_temp'
+        root.mkdir(exist_ok=True)
+        return root
+
+    def _align(self, audio_path: Path, audio_np: np.ndarray, audio_sr: int, split_points_df: pd.DataFrame,
+               final_transcript: Dict[str, Any], total_duration_s: float,
+               cut_segments: List[List[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Builds the MFA corpus for the transcript, aligns it and returns the normalized word
+        timings. When `cut_segments` is given, only the chunks around those cuts are aligned.
+        """
+        mfa_chunker_svc = self.services['mfa_chunker']
+        mfa_chunks = mfa_chunker_svc.run(split_points_df, final_transcript, total_duration_s=total_duration_s)
+        if cut_segments:
+            mfa_chunks = self._select_chunks_for_cuts(mfa_chunks, cut_segments)
+        # The MFA workspace is scratch data that only MFA reads back. Each run gets its own
+        # unique directory. The 16 kHz corpus plus MFA's TextGrids take roughly 2x the
+        # mono 16-bit size of the audio (an upper bound when only some chunks are aligned).
+        workspace_bytes = 2 * 2 * int(total_duration_s * MFA_SAMPLE_RATE)
+        mfa_temp_dir = Path(tempfile.mkdtemp(prefix=f"mfa_{audio_path.stem}_", dir=self._mfa_temp_root(workspace_bytes)))
+        try:
+            audio_splitter_svc = self.services['audio_splitter']
+            mfa_audio = audio_splitter_svc.prepare_for_mfa(audio_np, audio_sr)
 
+            def _prepare_mfa_chunk(chunk: Dict[str, Any]):
+                lab_path = mfa_temp_dir / f"mfa_chunk_{chunk['id']}.lab"
+                lab_path.write_text(normalize_text_for_mfa(chunk['transcript']))
+                audio_splitter_svc.split_and_save_chunk(mfa_audio, MFA_SAMPLE_RATE, chunk['start_s'] * 1000, chunk['end_s'] * 1000, mfa_temp_dir / f"mfa_chunk_{chunk['id']}.wav")
 
-    def run(self, audio_path: Path):
-        # --- Stages 1-5 (Unchanged) ---
+            # Each chunk is an independent slice of the shared read-only buffer plus two
+            # file writes, so the corpus is written concurrently.
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+                list(pool.map(_prepare_mfa_chunk, mfa_chunks))
+            mfa_aligner_svc = self.services['mfa_aligner']
+            mfa_output_dir = mfa_aligner_svc.run(mfa_temp_dir, mfa_temp_dir)
+            mfa_normalizer_svc = self.services['mfa_normalizer']
+            return mfa_normalizer_svc.run(mfa_output_dir, mfa_chunks)
+        finally:
+            shutil.rmtree(mfa_temp_dir, ignore_errors=True)
+
+    def _stage_vad(self, ctx: Dict[str, Any]) -> bool:
+        audio_path = ctx['audio_path']
         logging.info(f"\n--- Starting pipeline for: {audio_path.name} ---")
-        audio = AudioSegment.from_file(audio_path)
-        total_duration_s = len(audio) / 1000.0
-        
+        # The file is decoded once, to int16 PCM shaped (frames, channels): VAD runs on it
+        # and the splitter and editor slice it directly. Decoding still overlaps other
+        # work, since the VAD stage's workers handle several files at a time.
+        audio_np, audio_sr = _load_pcm16(audio_path)
+
         logging.info("Executing VAD stage...")
-        vad_cache_path = self._get_cache_path('vad', audio_path)
-        if self.use_cache and vad_cache_path.exists():
-            vad_df = pd.read_csv(vad_cache_path)
-        else:
-            vad_df = self.services['vad'].run(audio_path)
-            if self.use_cache: vad_df.to_csv(vad_cache_path, index=False)
+        vad_df = self._cached('vad', audio_path, lambda: self.services['vad'].run(audio_path, pcm=audio_np, sr=audio_sr),
+                              key_extra=VAD_OUTPUT_VERSION)
         logging.info("VAD stage complete.")
 
-        if vad_df.empty: return None
+        ctx['vad_df'] = vad_df
+        ctx['audio_np'] = audio_np
+        ctx['audio_sr'] = audio_sr
+        ctx['total_duration_s'] = len(audio_np) / audio_sr
+        # Same rounding as len(AudioSegment), which the split-point service was written against.
+        ctx['audio_duration_ms'] = round(1000 * len(audio_np) / audio_sr)
+        return not vad_df.empty
 
+    def _stage_split_points(self, ctx: Dict[str, Any]) -> bool:
         logging.info("Executing Split Point Generation stage...")
-        split_points_cache_path = self._get_cache_path('split_points', audio_path)
-        if self.use_cache and split_points_cache_path.exists():
-            split_points_df = pd.read_csv(split_points_cache_path)
-        else:
-            split_points_df = self.services['split_point'].run(vad_df, len(audio))
-            if self.use_cache: split_points_df.to_csv(split_points_cache_path, index=False)
+        # Split points are derived from the VAD output, so they share its version.
+        ctx['split_points_df'] = self._cached('split_points', ctx['audio_path'], lambda: self.services['split_point'].run(ctx['vad_df'], ctx['audio_duration_ms']),
+                                              key_extra=VAD_OUTPUT_VERSION)
         logging.info("Split Point Generation complete.")
+        return True
 
+    def _stage_scribe(self, ctx: Dict[str, Any]) -> bool:
         logging.info("Executing Scribe Transcription stage...")
-        final_transcript_cache_path = self._get_cache_path('scribe', audio_path)
-        if self.use_cache and final_transcript_cache_path.exists():
-            with open(final_transcript_cache_path, 'r') as f:
-                final_transcript = json.load(f)
-        else:
-            transcription_chunks_df = self.services['transcription_chunker'].run(split_points_df)
-            splitter_df = transcription_chunks_df.rename(columns={'chunk_start_ms': 'start_ms', 'chunk_end_ms': 'end_ms'})
-            chunks_dir = self.cache_root.parent / self.config['cache_paths']['audio_chunks']
-            chunks_dir.mkdir(exist_ok=True, parents=True)
-            chunk_paths = self.services['audio_splitter'].run(audio, splitter_df, chunks_dir, audio_path.stem)
-            raw_scribe_results = []
-            scribe_cache_dir = self.cache_root.parent / self.config['cache_paths']['scribe']
-            scribe_cache_dir.mkdir(exist_ok=True, parents=True)
-            for i, chunk_path in enumerate(chunk_paths):
-                scribe_chunk_cache_file = scribe_cache_dir / f"{chunk_path.stem}.json"
-                if self.use_cache and scribe_chunk_cache_file.exists():
-                    with open(scribe_chunk_cache_file, 'r') as f: result = json.load(f)
-                else:
-                    result = self.services['scribe'].run(chunk_path)
-                    if self.use_cache:
-                        with open(scribe_chunk_cache_file, 'w') as f: json.dump(result, f, indent=2)
-                raw_scribe_results.append(result)
-            final_transcript = self.services['scribe_normalizer'].run(raw_scribe_results, transcription_chunks_df)
-            if self.use_cache:
-                with open(final_transcript_cache_path, 'w') as f: json.dump(final_transcript, f, indent=2)
+        ctx['final_transcript'] = self._cached('scribe', ctx['audio_path'], lambda: self._transcribe(
+            ctx['audio_path'], ctx['audio_np'], ctx['audio_sr'], ctx['split_points_df']
+        ))
         logging.info("Scribe Transcription stage complete.")
+        return True
 
-        logging.info("Executing MFA Alignment stage...")
-        mfa_cache_path = self._get_cache_path('mfa', audio_path)
-        if self.use_cache and mfa_cache_path.exists():
-            with open(mfa_cache_path, 'r') as f:
-                final_mfa_data = json.load(f)
-        else:
-            mfa_chunker_svc = self.services['mfa_chunker']
-            mfa_chunks = mfa_chunker_svc.run(split_points_df, final_transcript, total_duration_s=total_duration_s)
-            mfa_temp_dir = self.cache_root / "mfa_temp"
-            if mfa_temp_dir.exists(): shutil.rmtree(mfa_temp_dir)
-            mfa_temp_dir.mkdir()
-            audio_splitter_svc = self.services['audio_splitter']
-            for chunk in mfa_chunks:
-                lab_path = mfa_temp_dir / f"mfa_chunk_{chunk['id']}.lab"
-                normalized_text = normalize_text_for_mfa(chunk['transcript'])
-                with open(lab_path, 'w') as f: f.write(normalized_text)
-                audio_splitter_svc.split_and_save_chunk(audio, chunk['start_s'] * 1000, chunk['end_s'] * 1000, mfa_temp_dir / f"mfa_chunk_{chunk['id']}.wav")
-            mfa_aligner_svc = self.services['mfa_aligner']
-            mfa_output_dir = mfa_aligner_svc.run(mfa_temp_dir, mfa_temp_dir)
-            mfa_normalizer_svc = self.services['mfa_normalizer']
-            final_mfa_data = mfa_normalizer_svc.run(mfa_output_dir, mfa_chunks)
-            if self.use_cache:
-                with open(mfa_cache_path, 'w') as f: json.dump(final_mfa_data, f, indent=4)
-            shutil.rmtree(mfa_temp_dir)
-        logging.info("MFA Alignment stage complete.")
-        
+    def _stage_llm(self, ctx: Dict[str, Any]) -> bool:
         logging.info("Executing LLM Cut Selection stage...")
-        llm_cache_path = self._get_cache_path('llm', audio_path)
-        if self.use_cache and llm_cache_path.exists():
-            with open(llm_cache_path, 'r') as f:
-                marked_transcript = f.read()
-        else:
-            llm_service = self.services['llm_cut_selector']
-            transcript_text = final_transcript.get('text', '')
-            marked_transcript = llm_service.run(transcript_text)
-            if self.use_cache:
-                with open(llm_cache_path, 'w') as f: f.write(marked_transcript)
+        ctx['marked_transcript'] = self._cached('llm', ctx['audio_path'], lambda: self.services['llm_cut_selector'].run(ctx['final_transcript'].get('text', '')))
+        ctx['cut_segments'] = self.services['cut_parser'].run(ctx['final_transcript']['words'], ctx['marked_transcript'])
         logging.info("LLM Cut Selection stage complete.")
-        
-        logging.info("Executing Final Editing and Dataset Generation stage...")
+        return True
+
+    def _stage_mfa(self, ctx: Dict[str, Any]) -> bool:
+        # Only the edit stage reads the MFA timings, and it stops when there are no cuts.
+        if not ctx['cut_segments']:
+            logging.info("No cut segments identified by the parser. Skipping alignment and editing.")
+            return False
+        logging.info("Executing MFA Alignment stage...")
+        # By default only the chunks around the LLM's cuts are aligned, since nothing else
+        # reads the MFA timings.
+        cut_segments = ctx['cut_segments'] if self.config.get('mfa_align_cut_chunks_only', True) else None
+        ctx['final_mfa_data'] = self._cached('mfa', ctx['audio_path'], lambda: self._align(
+            ctx['audio_path'], ctx['audio_np'], ctx['audio_sr'], ctx['split_points_df'], ctx['final_transcript'], ctx['total_duration_s'],
+            cut_segments=cut_segments
+        ), key_extra=json.dumps(cut_segments) if cut_segments else '')
+        logging.info("MFA Alignment stage complete.")
+        return True
 
-        y_full, sr = librosa.load(str(audio_path), sr=None, mono=True)
+    def _stage_edit(self, ctx: Dict[str, Any]) -> bool:
+        audio_path = ctx['audio_path']
+        audio_np, audio_sr = ctx['audio_np'], ctx['audio_sr']
+        final_transcript = ctx['final_transcript']
+        final_mfa_data = ctx['final_mfa_data']
+        split_points_df = ctx['split_points_df']
+
+        logging.info("Executing Final Editing and Dataset Generation stage...")
 
-        cut_parser_svc = self.services['cut_parser']
         audio_editor_svc = self.services['audio_editor']
         dataset_generator_svc = self.services['dataset_generator']
 
-        cut_segments = cut_parser_svc.run(final_transcript['words'], marked_transcript)
+        cut_segments = ctx['cut_segments']
 
         if not cut_segments:
             logging.info("No cut segments identified by the parser. Skipping editing.")
-            return
-
+            return False
+
+        mfa_by_id = {w['id']: w for w in final_mfa_data}
+        # Scribe word starts are non-decreasing, so each cut's candidate words can be
+        # located with a binary search instead of a pass over the whole transcript.
+        transcript_words = final_transcript['words']
+        word_starts = np.fromiter((w['start'] for w in transcript_words), dtype=np.float64, count=len(transcript_words))
+        # The MFA data may only cover the chunks around the cuts, so the last word is
+        # taken from the transcript itself.
+        last_word_id_in_transcript = max((w['id'] for w in transcript_words if w.get('type') == 'word'), default=-1)
+        # Cuts that fall in the same split-point chunk share the same word list. This is
+        # a local rather than an attribute because several files are edited concurrently.
+        chunk_words_cache: Dict[tuple, List[Dict[str, Any]]] = {}
+
+        # (cut number, word ids) of every cut that doesn't touch a boundary word.
+        editable_cuts = []
         for i, cut_word_ids in enumerate(cut_segments):
-            last_word_id_in_transcript = len(final_mfa_data) - 1
             if not cut_word_ids or cut_word_ids[0] == 0 or cut_word_ids[-1] == last_word_id_in_transcript:
                 logging.warning(f"Skipping cut segment {cut_word_ids} because it involves a boundary word.")
                 continue
-
-            logging.info(f"Processing cut {i+1}/{len(cut_segments)} (word IDs: {cut_word_ids})...")
-            
-            edit_results = audio_editor_svc.run(
-                cut_word_ids=cut_word_ids,
-                full_audio=audio,
-                y_full=y_full,
-                sr=sr,
-                mfa_data=final_mfa_data,
-                scribe_data=final_transcript,
-                split_points_df=split_points_df
-            )
-            
+            editable_cuts.append((i, cut_word_ids))
+
+        logging.info(f"Editing {len(editable_cuts)} of {len(cut_segments)} cut(s)...")
+        all_edit_results = audio_editor_svc.run_batch(
+            cut_word_ids_list=[cut_word_ids for _, cut_word_ids in editable_cuts],
+            # The PCM decoded for VAD is the only copy of the file the editor needs: it
+            # scans its signs and wraps slices of it as the output clips.
+            pcm=audio_np,
+            sr=audio_sr,
+            mfa_data=final_mfa_data,
+            split_points_df=split_points_df
+        )
+
+        for (i, cut_word_ids), edit_results in zip(editable_cuts, all_edit_results):
             if edit_results is None:
                 continue
             
             chunk_start_s = edit_results["metadata"]["chunk_start_s_abs"]
             chunk_end_s = edit_results["metadata"]["chunk_end_s_abs"]
             
-            chunk_words = [
-                word for word in final_transcript['words'] 
-                if word['start'] >= chunk_start_s and word['end'] <= chunk_end_s
-            ]
+            chunk_key = (round(chunk_start_s, 3), round(chunk_end_s, 3))
+            chunk_words = chunk_words_cache.get(chunk_key)
+            if chunk_words is None:
+                lo = np.searchsorted(word_starts, chunk_start_s, side='left')
+                hi = np.searchsorted(word_starts, chunk_end_s, side='right')
+                chunk_words = [word for word in transcript_words[lo:hi] if word['end'] <= chunk_end_s]
+                chunk_words_cache[chunk_key] = chunk_words
 
             # --- MODIFICATION START: Determine if the datapoint is usable ---
             is_usable = True
             for word in chunk_words:
                 # Find the corresponding word in MFA data to check its reliability
-                mfa_word = next((w for w in final_mfa_data if w['id'] == word['id']), None)
+                mfa_word = mfa_by_id.get(word['id'])
                 if mfa_word and not mfa_word.get('is_timestamp_reliable', True):
                     is_usable = False
                     logging.warning(f"Cut {i+1} marked as unusable due to unreliable timestamp in word: {word}")
@@ -211,6 +494,84 @@ class PipelineOrchestrator:
             )
         
         logging.info("Final Editing and Dataset Generation stage complete.")
+        return True
+
+    def run_batch(self, audio_paths: List[Path], on_file_done: Callable[[Path], None] = None) -> Dict[Path, Exception]:
+        """
+        Runs several audio files through the pipeline with the stages overlapped across
+        files, so e.g. one file can be aligning with MFA while the next waits on Scribe.
+
+        Every stage has its own worker threads (`file_concurrency` per stage, default 4)
+        fed by a queue. Each file holds its decoded PCM from the VAD stage until it leaves
+        the pipeline, so at most `max_files_in_flight` files (default 2 x file_concurrency)
+        are admitted at once; the next file is only decoded once one of them is done.
+        `on_file_done` is called once per file when it leaves the pipeline, whether it
+        finished, stopped early or failed.
+
+        Returns:
+            Dict[Path, Exception]: The files that failed, mapped to their exception.
+        """
+        stages = [
+            self._stage_vad,
+            self._stage_split_points,
+            self._stage_scribe,
+            self._stage_llm,
+            self._stage_mfa,
+            self._stage_edit,
+        ]
+        workers_per_stage = self.config.get('file_concurrency', 4)
+        inboxes = [queue.Queue(maxsize=workers_per_stage) for _ in stages]
+        in_flight = threading.BoundedSemaphore(self.config.get('max_files_in_flight', 2 * workers_per_stage))
+        failures: Dict[Path, Exception] = {}
+
+        def _worker(stage_index: int):
+            stage, inbox = stages[stage_index], inboxes[stage_index]
+            while True:
+                ctx = inbox.get()
+                if ctx is _STOP:
+                    return
+                try:
+                    keep_going = stage(ctx)
+                except Exception as e:
+                    logging.error(f"\n❌ An unhandled error occurred for {ctx['audio_path'].name}: {e}", exc_info=True)
+                    failures[ctx['audio_path']] = e
+                    keep_going = False
+                if keep_going and stage_index + 1 < len(stages):
+                    inboxes[stage_index + 1].put(ctx)
+                    continue
+                # The edit stage is the last reader of the PCM; drop it before admitting
+                # the next file rather than whenever this ctx is collected.
+                ctx.pop('audio_np', None)
+                in_flight.release()
+                if on_file_done:
+                    on_file_done(ctx['audio_path'])
+
+        workers = [
+            [threading.Thread(target=_worker, args=(i,), daemon=True) for _ in range(workers_per_stage)]
+            for i in range(len(stages))
+        ]
+        for group in workers:
+            for t in group:
+                t.start()
+
+        for audio_path in audio_paths:
+            in_flight.acquire()
+            inboxes[0].put({'audio_path': audio_path})
+        # Shut the stages down in order: a stage only stops once everything upstream
+        # of it has drained, so no file is left behind in a queue.
+        for inbox, group in zip(inboxes, workers):
+            for _ in group:
+                inbox.put(_STOP)
+            for t in group:
+                t.join()
+
+        return failures
+
+    def run(self, audio_path: Path):
+        """Runs the full pipeline for a single audio file, raising any error it hits."""
+        failures = self.run_batch([audio_path])
+        if audio_path in failures:
+            raise failures[audio_path]
 
 # # src/pipeline_orchestrator.py
 # from pathlib import Path
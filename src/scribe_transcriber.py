@@ -1,14 +1,29 @@
 import logging
-import requests
+import functools
 from typing import Dict, Any
 
 # Assuming a similar config loader utility exists.
 # If not, this function would need to be created to load configuration
 # from a file (e.g., config.yaml).
 from .utils.config_loader import load_config 
+from .utils.http_session import make_session, post_multipart_with_retry
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Module-level session so concurrent callers share a pool of keep-alive connections.
+_SESSION = make_session()
+
+@functools.lru_cache(maxsize=1)
+def _get_scribe_api_key() -> str:
+    """Reads the ElevenLabs key from config.yaml once; later calls reuse it."""
+    # Load configuration, assuming it contains an 'elevenlabs' section
+    app_config = load_config()
+    scribe_api_key = app_config.get('elevenlabs', {}).get('api_key')
+    if not scribe_api_key or scribe_api_key == "YOUR_ELEVENLABS_API_KEY_HERE":
+        logging.error("ElevenLabs API key not found or not set in config.yaml.")
+        raise ValueError("ElevenLabs API key not configured.")
+    return scribe_api_key
+
 def get_scribe_results(audio_path: str) -> Dict[str, Any]:
     """
     Makes a single, comprehensive call to the ElevenLabs Scribe API and returns
@@ -22,12 +37,7 @@ def get_scribe_results(audio_path: str) -> Dict[str, Any]:
     """
     logging.info(f"Requesting transcription from ElevenLabs Scribe for '{audio_path}'")
     try:
-        # Load configuration, assuming it contains an 'elevenlabs' section
-        app_config = load_config()
-        scribe_api_key = app_config.get('elevenlabs', {}).get('api_key')
-        if not scribe_api_key or scribe_api_key == "YOUR_ELEVENLABS_API_KEY_HERE":
-            logging.error("ElevenLabs API key not found or not set in config.yaml.")
-            raise ValueError("ElevenLabs API key not configured.")
+        scribe_api_key = _get_scribe_api_key()
 
         # API endpoint for ElevenLabs Scribe
         url = 'https://api.elevenlabs.io/v1/speech-to-text'
@@ -45,19 +55,18 @@ def get_scribe_results(audio_path: str) -> Dict[str, Any]:
             'diarize': 'true'     # Enable speaker detection
         }
         
-        with open(audio_path, 'rb') as audio_file:
-            # The files payload for the multipart/form-data request
-            files = {
-                'file': (audio_path, audio_file, 'audio/mpeg') # MIME type can be adjusted
-            }
+        # The multipart/form-data body is streamed from the file in fixed-size pieces
+        # rather than assembled in memory; 429/5xx responses are retried with backoff.
+        logging.info("Sending audio to ElevenLabs Scribe...")
+        response = post_multipart_with_retry(
+            _SESSION, url, data, audio_path, str(audio_path), 'audio/mpeg', # MIME type can be adjusted
+            headers=headers
+        )
+        response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
 
-            logging.info("Sending audio to ElevenLabs Scribe...")
-            response = requests.post(url, headers=headers, data=data, files=files)
-            response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
-            
-            result = response.json()
-            logging.info("Successfully received full raw response from Scribe.")
-            return result
+        result = response.json()
+        logging.info("Successfully received full raw response from Scribe.")
+        return result
 
     except Exception as e:
         logging.error(f"An error occurred while calling ElevenLabs Scribe API: {e}", exc_info=True)
@@ -1,17 +1,43 @@
 # src/services/audio_editor_service.py
 import logging
-from pathlib import Path
 from typing import List, Dict, Any, Tuple
-from pydub import AudioSegment
 import numpy as np
-import librosa
 import pandas as pd
 import random
+from concurrent.futures import ThreadPoolExecutor
+from numba import njit
+
+# The zero-crossing scans are compiled loops: they stop at the first sign change
+# without allocating. `run_batch` hands them a per-file int8 sign array, so each
+# step reads one byte instead of a float sample. They release the GIL, so cuts
+# edited on parallel threads scan concurrently.
+@njit(cache=True, boundscheck=False, nogil=True)
+def _zero_crossing_forward(signal, start):
+    start_sign = np.sign(signal[start])
+    for i in range(start + 1, signal.shape[0]):
+        if np.sign(signal[i]) != start_sign:
+            return i - 1
+    return signal.shape[0] - 1
+
+@njit(cache=True, boundscheck=False, nogil=True)
+def _zero_crossing_backward(signal, start):
+    start_sign = np.sign(signal[start])
+    for i in range(start - 1, -1, -1):
+        if np.sign(signal[i]) != start_sign:
+            return i + 1
+    return 0
 
 class AudioEditorService:
     """
     Handles the logic for creating edited audio clips based on cut events.
     """
+    # The split-point columns this service reads, so cached tables can be loaded projected.
+    SPLIT_POINT_COLUMNS = ['split_point_ms']
+    # [start, end] of the natural, backward-invasion and forward-invasion cut, in that order.
+    BOUNDARY_COLUMNS = [
+        'natural_start', 'natural_end', 'backward_start', 'backward_end', 'forward_start', 'forward_end'
+    ]
+
     def __init__(self, config: Dict[str, Any]):
         logging.info("AudioEditorService initialized.")
         self.config = config.get('editing', {})
@@ -22,6 +48,8 @@ class AudioEditorService:
         self.backward_invasion_interval = self.config.get('backward_phoneme_invasion_interval', [0.7, 0.9])
         self.forward_invasion_interval = self.config.get('forward_phoneme_invasion_interval', [0.7, 0.9])
         # --- END MODIFICATION ---        
+        # Cuts of one file are independent, so run_batch edits them on this many threads.
+        self.cut_workers = self.config.get('cut_workers', 4)
 
     def _find_outward_zero_crossing(self, signal: np.ndarray, sample_index: int, direction: str) -> int:
         """Finds the nearest 'outward' zero-crossing from a given sample index."""
@@ -32,100 +60,237 @@ class AudioEditorService:
         if start_sign == 0: return sample_index
 
         if direction == 'forward':
-            for i in range(sample_index + 1, len(signal)):
-                if np.sign(signal[i]) != start_sign: return i - 1
-            return len(signal) - 1
+            return int(_zero_crossing_forward(signal, sample_index))
         else: # backward
-            for i in range(sample_index - 1, -1, -1):
-                if np.sign(signal[i]) != start_sign: return i + 1
-            return 0
+            return int(_zero_crossing_backward(signal, sample_index))
 
-    def _get_cut_boundaries(
+    def _find_outward_zero_crossing_batch(self, signal: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+        """Snaps an (n, 2) array of [start, end] sample indices outward: starts backward, ends forward."""
+        snapped = np.empty_like(bounds)
+        for i, (start, end) in enumerate(bounds):
+            snapped[i, 0] = self._find_outward_zero_crossing(signal, int(start), 'backward')
+            snapped[i, 1] = self._find_outward_zero_crossing(signal, int(end), 'forward')
+        return snapped
+
+    def _batch_cut_boundaries(
         self,
-        segment_word_ids: List[int],
-        word_id_map: Dict[int, Dict],
+        cut_word_ids_list: List[List[int]],
         all_words_list: List[Dict],
-        backward_invasion: float,
-        forward_invasion: float
-    ) -> Tuple[float, float]:
-        """Calculates the absolute start and end time for a cut segment."""
-        first_word_id = segment_word_ids[0]
-        last_word_id = segment_word_ids[-1]
-        
-        first_word_of_segment = word_id_map[first_word_id]
-        last_word_of_segment = word_id_map[last_word_id]
-        
-        first_word_index = next((i for i, item in enumerate(all_words_list) if item["id"] == first_word_id), -1)
-        last_word_index = next((i for i, item in enumerate(all_words_list) if item["id"] == last_word_id), -1)
-
-        if backward_invasion > 0:
-            prev_word = all_words_list[first_word_index - 1] if first_word_index > 0 else None
-            if prev_word and prev_word.get('phonemes'):
-                last_phoneme = prev_word['phonemes'][-1]
-                duration = last_phoneme['end'] - last_phoneme['start']
-                start_time = last_phoneme['end'] - (duration * backward_invasion)
-            else:
-                start_time = first_word_of_segment['start']
-        else:
-            prev_word = all_words_list[first_word_index - 1] if first_word_index > 0 else None
-            if prev_word:
-                start_time = (prev_word['end'] + first_word_of_segment['start']) / 2
-            else:
-                start_time = 0.0
-
-        if forward_invasion > 0:
-            next_word = all_words_list[last_word_index + 1] if last_word_index != -1 and last_word_index < len(all_words_list) - 1 else None
-            if next_word and next_word.get('phonemes'):
-                first_phoneme = next_word['phonemes'][0]
-                duration = first_phoneme['end'] - first_phoneme['start']
-                end_time = first_phoneme['start'] + (duration * forward_invasion)
-            else:
-                end_time = last_word_of_segment['end']
-        else:
-            next_word = all_words_list[last_word_index + 1] if last_word_index != -1 and last_word_index < len(all_words_list) - 1 else None
-            if next_word:
-                end_time = (last_word_of_segment['end'] + next_word['start']) / 2
-            else:
-                end_time = last_word_of_segment['end']
-                
-        return start_time, end_time
-
-    def _perform_direct_cut(self, audio: AudioSegment, start_s: float, end_s: float) -> AudioSegment:
+        word_index_map: Dict[int, int]
+    ) -> pd.DataFrame:
+        """
+        Calculates the absolute start and end times of the natural, backward-invasion and
+        forward-invasion variant of every cut at once. Each word's times and edge phonemes
+        are gathered into arrays a single time, so a cut only costs a few indexed lookups.
+
+        Cuts that name a word missing from the MFA data are logged and left out. The frame
+        is indexed by each cut's position in `cut_word_ids_list` and holds the invasion
+        factors drawn for it plus the BOUNDARY_COLUMNS.
+        """
+        positions, first_indices, last_indices = [], [], []
+        for position, cut_word_ids in enumerate(cut_word_ids_list):
+            missing = next((word_id for word_id in (cut_word_ids[0], cut_word_ids[-1]) if word_id not in word_index_map), None)
+            if missing is not None:
+                logging.error(f"FATAL: Word with ID {missing!r} specified in a cut was not found in the MFA data. Skipping this cut.")
+                continue
+            positions.append(position)
+            first_indices.append(word_index_map[cut_word_ids[0]])
+            last_indices.append(word_index_map[cut_word_ids[-1]])
+        if not positions:
+            return pd.DataFrame(columns=['backward_factor', 'forward_factor'] + self.BOUNDARY_COLUMNS)
+
+        # --- MODIFICATION: Select a random factor for each unnatural cut ---
+        factors = np.array([
+            (random.uniform(self.backward_invasion_interval[0], self.backward_invasion_interval[1]),
+             random.uniform(self.forward_invasion_interval[0], self.forward_invasion_interval[1]))
+            for _ in positions
+        ], dtype=np.float64)
+        backward_factor, forward_factor = factors[:, 0], factors[:, 1]
+        # --- END MODIFICATION ---
+
+        n_words = len(all_words_list)
+        word_starts = np.fromiter((w['start'] for w in all_words_list), dtype=np.float64, count=n_words)
+        word_ends = np.fromiter((w['end'] for w in all_words_list), dtype=np.float64, count=n_words)
+        has_phonemes = np.fromiter((bool(w.get('phonemes_start') or w.get('phonemes')) for w in all_words_list), dtype=bool, count=n_words)
+
+        def edge_phoneme_times(phoneme_index: int, key: str) -> np.ndarray:
+            # Words carry their phonemes as parallel phonemes_start/phonemes_end columns;
+            # MFA caches written before that hold a list of phoneme dicts instead.
+            column = f'phonemes_{key}'
+            return np.fromiter(
+                (w[column][phoneme_index] if w.get(column)
+                 else w['phonemes'][phoneme_index][key] if w.get('phonemes')
+                 else np.nan for w in all_words_list),
+                dtype=np.float64, count=n_words
+            )
+
+        first = np.array(first_indices)
+        last = np.array(last_indices)
+        has_prev = first > 0
+        has_next = last < n_words - 1
+        # Clamped so the gathers stay in range; the masks pick the fallback where needed.
+        prev = np.maximum(first - 1, 0)
+        nxt = np.minimum(last + 1, n_words - 1)
+
+        natural_start = np.where(has_prev, (word_ends[prev] + word_starts[first]) / 2, 0.0)
+        natural_end = np.where(has_next, (word_ends[last] + word_starts[nxt]) / 2, word_ends[last])
+
+        # Backward invasion keeps (1 - factor) of the previous word's last phoneme.
+        last_phoneme_start, last_phoneme_end = edge_phoneme_times(-1, 'start'), edge_phoneme_times(-1, 'end')
+        backward_start = np.where(
+            has_prev & has_phonemes[prev],
+            last_phoneme_end[prev] - ((last_phoneme_end[prev] - last_phoneme_start[prev]) * backward_factor),
+            word_starts[first]
+        )
+        backward_start = np.where(backward_factor > 0, backward_start, natural_start)
+
+        # Forward invasion removes the first `factor` of the next word's first phoneme.
+        first_phoneme_start, first_phoneme_end = edge_phoneme_times(0, 'start'), edge_phoneme_times(0, 'end')
+        forward_end = np.where(
+            has_next & has_phonemes[nxt],
+            first_phoneme_start[nxt] + ((first_phoneme_end[nxt] - first_phoneme_start[nxt]) * forward_factor),
+            word_ends[last]
+        )
+        forward_end = np.where(forward_factor > 0, forward_end, natural_end)
+
+        return pd.DataFrame({
+            'backward_factor': backward_factor,
+            'forward_factor': forward_factor,
+            'natural_start': natural_start,
+            'natural_end': natural_end,
+            'backward_start': backward_start,
+            'backward_end': natural_end,
+            'forward_start': natural_start,
+            'forward_end': forward_end,
+        }, index=positions)
+
+    def _perform_direct_cut(self, clip: Tuple[int, int], sr: int, start_s: float, end_s: float,
+                            n_source_frames: int) -> Tuple[Tuple[int, int], ...]:
+        """
+        Removes [start_s, end_s) (relative to the clip) from a clip given as a source frame
+        range, returning the frame ranges that remain. They hold the same frames as
+        clip[:start_ms] + clip[end_ms:] on a pydub segment, including the whole-ms length
+        of the tail and the silence pydub pads when a bound rounds past the clip.
+        """
+        clip_start, clip_end = clip
+        n_frames = clip_end - clip_start
+        clip_ms = round(1000 * (n_frames / sr))
         start_ms = int(start_s * 1000)
         end_ms = int(end_s * 1000)
-        if start_ms < 0 or end_ms > len(audio) or start_ms >= end_ms:
-            logging.error(f"Invalid cut timestamps provided: start={start_ms}ms, end={end_ms}ms on a clip of {len(audio)}ms. Returning original clip.")
-            return audio
-        return audio[:start_ms] + audio[end_ms:]
-        
+        if start_ms < 0 or end_ms > clip_ms or start_ms >= end_ms:
+            logging.error(f"Invalid cut timestamps provided: start={start_ms}ms, end={end_ms}ms on a clip of {clip_ms}ms. Returning original clip.")
+            return (clip,)
+        frames_per_ms = sr / 1000.0
+        return (
+            self._clip_frames(clip, 0, int(start_ms * frames_per_ms), n_source_frames)
+            + self._clip_frames(clip, int(end_ms * frames_per_ms), int(clip_ms * frames_per_ms), n_source_frames)
+        )
+
+    def _clip_frames(self, clip: Tuple[int, int], start: int, end: int, n_source_frames: int) -> Tuple[Tuple[int, int], ...]:
+        """
+        Returns frames [start, end) of the clip as source frame ranges. Frames past the end
+        of the clip become a range past the end of the source, which is written as silence.
+        """
+        clip_start, clip_end = clip
+        low, high = min(clip_start + start, clip_end), min(clip_start + end, clip_end)
+        missing = (end - start) - (high - low)
+        if missing > 0:
+            return ((low, high), (n_source_frames, n_source_frames + missing))
+        return ((low, high),)
+
     def _is_scribe_spacing(self, time_s: float, scribe_data: Dict[str, Any]) -> bool:
         for word in scribe_data.get('words', []):
             if word['start'] <= time_s <= word['end']:
                 return word['type'] == 'spacing'
         return False
 
+    def _slice_frames(self, pcm: np.ndarray, sr: int, start_ms: int, end_ms: int) -> Tuple[int, int]:
+        """
+        Returns the frame range of pcm[start_ms:end_ms], with the same clamping and
+        ms -> frame rounding as slicing a pydub segment of the whole file. Like pydub's
+        padding, the end may run past the last frame; those frames are written as silence.
+        """
+        duration_ms = round(1000 * len(pcm) / sr)
+        start = int(min(start_ms, duration_ms) * (sr / 1000.0))
+        end = int(min(end_ms, duration_ms) * (sr / 1000.0))
+        return start, max(start, end)
+
+    def run_batch(self,
+            cut_word_ids_list: List[List[int]],
+            pcm: np.ndarray,
+            sr: int,
+            mfa_data: List[Dict],
+            split_points_df: pd.DataFrame
+           ) -> List[Dict]:
+        """
+        Edits every cut of one audio file in a single call. Everything that depends only
+        on the file (the word lookups, the sorted split points, the duration) is built
+        once and shared by all cuts. Returns one result per cut, None for skipped cuts.
+
+        Args:
+            pcm: The decoded samples, shaped (frames, channels). Output clips are returned
+                as frame ranges of it (under "source_pcm"), so no clip audio is copied.
+        """
+        pcm = np.ascontiguousarray(pcm)
+        # Only the sign of the mono mix matters for the zero-crossing search, so it is
+        # computed once per file as a contiguous int8 array (-1, 0, 1). The sign of the
+        # channel sum is the sign of the mean, without a float copy of the file.
+        y_signs = np.sign(pcm.sum(axis=1, dtype=np.int32)).astype(np.int8)
+        word_id_map = {word['id']: word for word in mfa_data}
+        word_index_map = {word['id']: i for i, word in enumerate(mfa_data)}
+        eligible_points_s = np.sort(split_points_df['split_point_ms'].to_numpy(dtype=np.float64) / 1000.0)
+        total_duration_s = round(1000 * len(pcm) / sr) / 1000.0
+
+        boundaries_df = self._batch_cut_boundaries(cut_word_ids_list, mfa_data, word_index_map)
+        anchors = boundaries_df[self.BOUNDARY_COLUMNS].to_numpy(dtype=np.float64).reshape(-1, 3, 2)
+        factors = boundaries_df[['backward_factor', 'forward_factor']].to_numpy(dtype=np.float64)
+        row_of_cut = {position: row for row, position in enumerate(boundaries_df.index)}
+
+        def edit(position: int) -> Dict:
+            row = row_of_cut.get(position)
+            if row is None:
+                return None
+            return self._edit_cut(cut_word_ids_list[position], anchors[row], factors[row], pcm, y_signs, sr, mfa_data, word_id_map, word_index_map, eligible_points_s, total_duration_s)
+
+        positions = range(len(cut_word_ids_list))
+        if self.cut_workers <= 1 or len(cut_word_ids_list) <= 1:
+            return [edit(position) for position in positions]
+        # Every cut reads the same arrays and writes only its own result, so threads
+        # share them without copies; map() keeps the results in input order.
+        with ThreadPoolExecutor(max_workers=min(self.cut_workers, len(cut_word_ids_list))) as pool:
+            return list(pool.map(edit, positions))
+
     def run(self,
             cut_word_ids: List[int],
-            full_audio: AudioSegment,
-            y_full: np.ndarray,
+            pcm: np.ndarray,
             sr: int,
             mfa_data: List[Dict],
-            scribe_data: Dict,
             split_points_df: pd.DataFrame
            ) -> Dict:
-        word_id_map = {word['id']: word for word in mfa_data}
+        return self.run_batch([cut_word_ids], pcm, sr, mfa_data, split_points_df)[0]
 
-        try:
-            first_word_to_cut = word_id_map[cut_word_ids[0]]
-            last_word_to_cut = word_id_map[cut_word_ids[-1]]
-        except KeyError as e:
-            logging.error(f"FATAL: Word with ID {e} specified in a cut was not found in the MFA data. Skipping this cut.")
-            return None
+    def _edit_cut(self,
+            cut_word_ids: List[int],
+            anchors_s: np.ndarray,
+            invasion_factors: np.ndarray,
+            pcm: np.ndarray,
+            y_signs: np.ndarray,
+            sr: int,
+            mfa_data: List[Dict],
+            word_id_map: Dict[int, Dict],
+            word_index_map: Dict[int, int],
+            eligible_points_s: np.ndarray,
+            total_duration_s: float
+           ) -> Dict:
+        # `anchors_s` is this cut's (3, 2) [start, end] rows from _batch_cut_boundaries,
+        # which has already dropped cuts naming words missing from the MFA data.
+        first_word_to_cut = word_id_map[cut_word_ids[0]]
+        last_word_to_cut = word_id_map[cut_word_ids[-1]]
 
         # --- MODIFICATION START: Final logic for chunking with context ---
         # 1. Identify the context words
-        first_word_index = next((i for i, item in enumerate(mfa_data) if item["id"] == cut_word_ids[0]), -1)
-        last_word_index = next((i for i, item in enumerate(mfa_data) if item["id"] == cut_word_ids[-1]), -1)
+        first_word_index = word_index_map.get(cut_word_ids[0], -1)
+        last_word_index = word_index_map.get(cut_word_ids[-1], -1)
 
         context_word_before = mfa_data[first_word_index - 1] if first_word_index > 0 else None
         context_word_after = mfa_data[last_word_index + 1] if last_word_index != -1 and last_word_index < len(mfa_data) - 1 else None
@@ -134,17 +299,14 @@ class AudioEditorService:
         context_start_time = context_word_before['start'] if context_word_before else first_word_to_cut['start']
         context_end_time = context_word_after['end'] if context_word_after else last_word_to_cut['end']
 
-        total_duration_s = len(full_audio) / 1000.0
-        eligible_points_s = (split_points_df['split_point_ms'] / 1000.0).tolist()
-
         # --- MODIFICATION START: Remove Scribe 'spacing' check ---
         # Find the nearest eligible point before the context start time.
-        start_candidates = [p for p in eligible_points_s if p <= context_start_time]
-        chunk_start_s = max(start_candidates) if start_candidates else 0.0
+        start_idx = np.searchsorted(eligible_points_s, context_start_time, side='right') - 1
+        chunk_start_s = float(eligible_points_s[start_idx]) if start_idx >= 0 else 0.0
 
         # Find the nearest eligible point after the context end time.
-        end_candidates = [p for p in eligible_points_s if p >= context_end_time]
-        chunk_end_s = min(end_candidates) if end_candidates else total_duration_s
+        end_idx = np.searchsorted(eligible_points_s, context_end_time, side='left')
+        chunk_end_s = float(eligible_points_s[end_idx]) if end_idx < len(eligible_points_s) else total_duration_s
         # --- MODIFICATION END ---
 
         # # 3. Find the nearest valid silent point that *contains* the required context
@@ -163,29 +325,17 @@ class AudioEditorService:
         #         break
         # --- MODIFICATION END ---
         
-        original_chunk = full_audio[int(chunk_start_s * 1000):int(chunk_end_s * 1000)]
-
-        nat_start, nat_end = self._get_cut_boundaries(cut_word_ids, word_id_map, mfa_data, 0.0, 0.0)
-        nat_start = self._find_outward_zero_crossing(y_full, int(nat_start * sr), 'backward') / sr
-        nat_end = self._find_outward_zero_crossing(y_full, int(nat_end * sr), 'forward') / sr
+        original_chunk = self._slice_frames(pcm, sr, int(chunk_start_s * 1000), int(chunk_end_s * 1000))
 
-        # --- MODIFICATION: Select a random factor for each unnatural cut ---
-        random_bwd_factor = random.uniform(self.backward_invasion_interval[0], self.backward_invasion_interval[1])
-        bwd_start, bwd_end = self._get_cut_boundaries(cut_word_ids, word_id_map, mfa_data, random_bwd_factor, 0.0)
-        # --- END MODIFICATION ---
-        bwd_start = self._find_outward_zero_crossing(y_full, int(bwd_start * sr), 'backward') / sr
-        bwd_end = self._find_outward_zero_crossing(y_full, int(bwd_end * sr), 'forward') / sr
-
-        # --- MODIFICATION: Select a random factor for each unnatural cut ---
-        random_fwd_factor = random.uniform(self.forward_invasion_interval[0], self.forward_invasion_interval[1])
-        fwd_start, fwd_end = self._get_cut_boundaries(cut_word_ids, word_id_map, mfa_data, 0.0, random_fwd_factor)
-        # --- END MODIFICATION ---
-        fwd_start = self._find_outward_zero_crossing(y_full, int(fwd_start * sr), 'backward') / sr
-        fwd_end = self._find_outward_zero_crossing(y_full, int(fwd_end * sr), 'forward') / sr
+        random_bwd_factor, random_fwd_factor = (float(factor) for factor in invasion_factors)
+        # One [start, end] row per variant; all six anchors are snapped to zero crossings together.
+        variants = ['natural_cut', 'backward_invasion', 'forward_invasion']
+        bounds_s = self._find_outward_zero_crossing_batch(y_signs, (anchors_s * sr).astype(np.int64)) / sr
+        bounds_rel = [(float(start) - chunk_start_s, float(end) - chunk_start_s) for start, end in bounds_s]
 
-        natural_cut_chunk = self._perform_direct_cut(original_chunk, nat_start - chunk_start_s, nat_end - chunk_start_s)
-        backward_invasion_chunk = self._perform_direct_cut(original_chunk, bwd_start - chunk_start_s, bwd_end - chunk_start_s)
-        forward_invasion_chunk = self._perform_direct_cut(original_chunk, fwd_start - chunk_start_s, fwd_end - chunk_start_s)
+        natural_cut_chunk, backward_invasion_chunk, forward_invasion_chunk = (
+            self._perform_direct_cut(original_chunk, sr, start_rel, end_rel, len(pcm)) for start_rel, end_rel in bounds_rel
+        )
 
         # return {
         #     "original_audio": original_chunk,
@@ -202,17 +352,19 @@ class AudioEditorService:
         # }
 
         # --- MODIFICATION START: Add the random factors to the returned metadata ---
+        # Each clip is a tuple of [start, end) frame ranges of `source_pcm`, written back
+        # to back; the dataset generator streams them to disk without building segments.
         return {
-            "original_audio": original_chunk,
+            "source_pcm": pcm,
+            "frame_rate": sr,
+            "original_audio": (original_chunk,),
             "natural_cut_audio": natural_cut_chunk,
             "backward_invasion_audio": backward_invasion_chunk,
             "forward_invasion_audio": forward_invasion_chunk,
             "metadata": {
                 "chunk_start_s_abs": chunk_start_s,
                 "chunk_end_s_abs": chunk_end_s,
-                "natural_cut_timestamps_relative": (nat_start - chunk_start_s, nat_end - chunk_start_s),
-                "backward_invasion_timestamps_relative": (bwd_start - chunk_start_s, bwd_end - chunk_start_s),
-                "forward_invasion_timestamps_relative": (fwd_start - chunk_start_s, fwd_end - chunk_start_s),
+                **{f"{name}_timestamps_relative": rel for name, rel in zip(variants, bounds_rel)},
                 "backward_invasion_factor_used": random_bwd_factor,
                 "forward_invasion_factor_used": random_fwd_factor
             }
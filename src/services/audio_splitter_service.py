@@ -1,36 +1,64 @@
 # src/services/audio_splitter_service.py
 from pathlib import Path
 import pandas as pd
-from pydub import AudioSegment
+import numpy as np
+import soundfile as sf
+import soxr
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+# MFA's pretrained acoustic models work on 16 kHz mono audio.
+MFA_SAMPLE_RATE = 16000
 
 class AudioSplitterService:
     """
     A service to split an audio file into chunks based on a DataFrame
     of start and end times.
     """
-    def __init__(self):
+    def __init__(self, max_workers: int = 8):
+        # libsndfile releases the GIL while writing, so chunk writes overlap on threads.
+        self.max_workers = max_workers
         logging.info("AudioSplitterService initialized.")
 
-    def run(self, audio: AudioSegment, transcription_chunks_df: pd.DataFrame, chunks_dir: Path, audio_name: str) -> list[Path]:
+    def run(self, audio: np.ndarray, sample_rate: int, transcription_chunks_df: pd.DataFrame, chunks_dir: Path, audio_name: str) -> list[Path]:
         """
         Splits the main audio into smaller chunks for transcription.
+
+        Args:
+            audio: The decoded PCM samples, shaped (frames, channels).
+            sample_rate: The sample rate of `audio`.
         """
-        chunk_paths = []
-        for i, row in transcription_chunks_df.iterrows():
-            start_ms = row['start_ms']
-            end_ms = row['end_ms']
-            
+        # Read the two columns as arrays rather than building a Series per row.
+        starts_ms = transcription_chunks_df['start_ms'].to_numpy()
+        ends_ms = transcription_chunks_df['end_ms'].to_numpy()
+        tasks = []
+        for i, start_ms, end_ms in zip(transcription_chunks_df.index, starts_ms, ends_ms):
             chunk_path = chunks_dir / f"{audio_name}_scribe_chunk_{i + 1}.wav"
+            tasks.append((start_ms, end_ms, chunk_path))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # list() drains the iterator so a failed write is raised here.
+            list(pool.map(lambda task: self.split_and_save_chunk(audio, sample_rate, *task), tasks))
             
-            self.split_and_save_chunk(audio, start_ms, end_ms, chunk_path)
-            chunk_paths.append(chunk_path)
-            
-        return chunk_paths
+        return [chunk_path for _, _, chunk_path in tasks]
 
-    def split_and_save_chunk(self, audio: AudioSegment, start_ms: float, end_ms: float, output_path: Path):
+    def prepare_for_mfa(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        """
+        Downmixes and resamples the full audio to 16 kHz mono int16 once, so every
+        MFA chunk can be cut from it without MFA resampling each file again.
+        """
+        full_scale = float(np.iinfo(audio.dtype).max + 1)
+        mono = audio.mean(axis=1, dtype=np.float32) / full_scale
+        if sample_rate != MFA_SAMPLE_RATE:
+            mono = soxr.resample(mono, sample_rate, MFA_SAMPLE_RATE, quality='HQ')
+        return (np.clip(mono, -1.0, 1.0) * 32767).astype(np.int16)
+
+    def split_and_save_chunk(self, audio: np.ndarray, sample_rate: int, start_ms: float, end_ms: float, output_path: Path):
         """
         Extracts a single audio chunk from the main audio and saves it to a file.
+
+        The chunk is a view into `audio`, so no samples are copied before the write.
         """
-        chunk = audio[start_ms:end_ms]
-        chunk.export(output_path, format="wav")
+        start_sample = int(start_ms * sample_rate / 1000)
+        end_sample = int(end_ms * sample_rate / 1000)
+        sf.write(output_path, audio[start_sample:end_sample], sample_rate, subtype='PCM_16')
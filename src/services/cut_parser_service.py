@@ -1,18 +1,153 @@
 # src/services/cut_parser_service.py
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+import numpy as np
+from numba import njit
+
+# Token kinds and codes for the compiled sync loop. Normalized strings are interned to
+# integer codes through the transcript's own vocabulary, so equal codes mean equal
+# strings (no hash collisions); LLM tokens outside that vocabulary can never match.
+_TOKEN_WORD, _TOKEN_OPEN, _TOKEN_CLOSE, _TOKEN_EMPTY = 0, 1, 2, 3
+_CODE_SPACING = -1
+_CODE_UNKNOWN = -2
+# Sync events recorded by the loop and replayed as log warnings afterwards.
+_EVENT_MISMATCH, _EVENT_RESYNC, _EVENT_SKIP = 0, 1, 2
+_LOOKAHEAD_LIMIT = 5
+
+@njit(cache=True)
+def _sync_tokens(token_kinds, token_codes, original_codes, original_is_word):
+    """
+    Walks the LLM tokens against the Scribe items. Returns the indices of the cut
+    words, the end offset of each cut segment within them, and an (n, 4) array of
+    (event, token index, word index, skipped tokens) sync events.
+    """
+    n_tokens = token_kinds.shape[0]
+    n_words = original_codes.shape[0]
+    cut_indices = np.empty(n_words, dtype=np.int64)
+    segment_ends = np.empty(n_words + 1, dtype=np.int64)
+    # Each mismatch records two events but advances only one token or word.
+    events = np.empty((2 * (n_tokens + n_words), 4), dtype=np.int64)
+    n_cut = 0
+    n_segments = 0
+    n_events = 0
+    committed = 0
+
+    token_idx = 0
+    word_idx = 0
+    is_inside_cut_segment = False
+
+    while token_idx < n_tokens and word_idx < n_words:
+        kind = token_kinds[token_idx]
+
+        if kind == _TOKEN_OPEN:
+            is_inside_cut_segment = True
+            n_cut = committed
+            token_idx += 1
+            continue
+
+        if kind == _TOKEN_CLOSE:
+            if is_inside_cut_segment:
+                is_inside_cut_segment = False
+                if n_cut > committed:
+                    segment_ends[n_segments] = n_cut
+                    n_segments += 1
+                    committed = n_cut
+            token_idx += 1
+            continue
+
+        if kind == _TOKEN_EMPTY:
+            token_idx += 1
+            continue
+
+        original_code = original_codes[word_idx]
+        if original_code == _CODE_SPACING:
+            word_idx += 1
+            continue
+
+        if token_codes[token_idx] == original_code:
+            if is_inside_cut_segment and original_is_word[word_idx]:
+                cut_indices[n_cut] = word_idx
+                n_cut += 1
+            token_idx += 1
+            word_idx += 1
+            continue
+
+        events[n_events, 0] = _EVENT_MISMATCH
+        events[n_events, 1] = token_idx
+        events[n_events, 2] = word_idx
+        events[n_events, 3] = 0
+        n_events += 1
+
+        skipped = 0
+        for i in range(1, _LOOKAHEAD_LIMIT + 1):
+            if token_idx + i < n_tokens and token_codes[token_idx + i] == original_code:
+                skipped = i
+                break
+
+        if skipped:
+            events[n_events, 0] = _EVENT_RESYNC
+            events[n_events, 1] = token_idx
+            events[n_events, 2] = word_idx
+            events[n_events, 3] = skipped
+            n_events += 1
+            token_idx += skipped
+            continue
+
+        events[n_events, 0] = _EVENT_SKIP
+        events[n_events, 1] = token_idx
+        events[n_events, 2] = word_idx
+        events[n_events, 3] = 0
+        n_events += 1
+        word_idx += 1
+
+    if is_inside_cut_segment and n_cut > committed:
+        segment_ends[n_segments] = n_cut
+        n_segments += 1
+        committed = n_cut
+
+    return cut_indices[:committed], segment_ends[:n_segments], events[:n_events]
 
 class CutParserService:
     """
     A service to parse a transcript marked with <cut> tags. This version correctly
     syncs against the full Scribe output, including non-word events.
     """
+    # Characters stripped from both ends of a token before comparing it.
+    _STRIP_CHARS = ".,;:?!'\"` "
+
     def __init__(self):
+        # (original_words, _encoded_originals result) of the last transcript parsed.
+        self._encoded_originals_cache = None
         logging.info("CutParserService initialized.")
 
     def _normalize_word(self, word: str) -> str:
         """Helper function to lowercase and remove surrounding punctuation."""
-        return word.lower().strip(".,;:?!'\"` ")
+        return word.strip(self._STRIP_CHARS).lower()
+
+    def _encoded_originals(self, original_words: List[Dict[str, Any]]) -> Tuple[List[str], Dict[str, int], np.ndarray, np.ndarray]:
+        """
+        Returns the normalized text of each Scribe item (None for spacing), the vocabulary
+        interning those strings, and the per-item codes and is-word flags for _sync_tokens.
+        Reused across calls on the same list.
+        """
+        # Keyed on identity: callers pass the loaded transcript list and never mutate it.
+        # Keeping a reference to the list stops its id from being reused for another one.
+        cached = self._encoded_originals_cache
+        if cached is not None and cached[0] is original_words:
+            return cached[1]
+        normalized = [
+            None if word.get('type') == 'spacing' else self._normalize_word(word.get('text', ''))
+            for word in original_words
+        ]
+        vocabulary: Dict[str, int] = {}
+        codes = np.fromiter(
+            (_CODE_SPACING if text is None else vocabulary.setdefault(text, len(vocabulary)) for text in normalized),
+            dtype=np.int64, count=len(normalized)
+        )
+        is_word = np.fromiter((word.get('type') == 'word' for word in original_words), dtype=np.bool_, count=len(original_words))
+        encoded = (normalized, vocabulary, codes, is_word)
+        self._encoded_originals_cache = (original_words, encoded)
+        return encoded
 
     def run(self, original_words: List[Dict[str, Any]], marked_transcript: str) -> List[List[int]]:
         """
@@ -23,81 +158,38 @@ class CutParserService:
         processed_text = marked_transcript.replace('<cut>', ' <cut> ').replace('</cut>', ' </cut> ')
         marked_tokens = processed_text.split()
 
-        all_segments = []
-        current_segment = []
-        
-        token_idx = 0
-        word_idx = 0
-        is_inside_cut_segment = False
-
-        while token_idx < len(marked_tokens) and word_idx < len(original_words):
-            token = marked_tokens[token_idx]
-
-            if token == '<cut>':
-                is_inside_cut_segment = True
-                current_segment = []
-                token_idx += 1
-                continue
-
-            if token == '</cut>':
-                if is_inside_cut_segment:
-                    is_inside_cut_segment = False
-                    if current_segment:
-                        all_segments.append(current_segment)
-                    current_segment = []
-                token_idx += 1
-                continue
-            
-            normalized_token = self._normalize_word(token)
-            if not normalized_token:
-                token_idx += 1
-                continue
-
-            original_word_obj = original_words[word_idx]
-
-            # --- MODIFICATION START: Correctly handle Scribe event types ---
-            # If the Scribe object is 'spacing', it has no token. Skip it.
-            if original_word_obj.get('type') == 'spacing':
-                word_idx += 1
-                continue
-            
-            # Use the 'text' key, not 'word'
-            original_text = original_word_obj.get('text', '')
-            normalized_original_word = self._normalize_word(original_text)
-            # --- MODIFICATION END ---
-
-            if normalized_token == normalized_original_word:
-                if is_inside_cut_segment:
-                    # We only want to cut actual words, so we check the type here.
-                    if original_word_obj.get('type') == 'word':
-                        current_segment.append(original_word_obj['id'])
-                token_idx += 1
-                word_idx += 1
-            else:
-                # Mismatch recovery logic
+        # Normalize every token and every original item once up front, then run the sync
+        # loop compiled over their integer codes. Spacing items have no text to match.
+        normalized_tokens = [self._normalize_word(token) for token in marked_tokens]
+        normalized_originals, vocabulary, original_codes, original_is_word = self._encoded_originals(original_words)
+
+        token_kinds = np.fromiter(
+            (_TOKEN_OPEN if token == '<cut>' else _TOKEN_CLOSE if token == '</cut>' else _TOKEN_WORD if normalized else _TOKEN_EMPTY
+             for token, normalized in zip(marked_tokens, normalized_tokens)),
+            dtype=np.int64, count=len(marked_tokens)
+        )
+        token_codes = np.fromiter(
+            (vocabulary.get(normalized, _CODE_UNKNOWN) for normalized in normalized_tokens),
+            dtype=np.int64, count=len(marked_tokens)
+        )
+        cut_indices, segment_ends, events = _sync_tokens(token_kinds, token_codes, original_codes, original_is_word)
+
+        # Mismatch recovery is logged after the loop, in the order it happened.
+        for event, token_idx, word_idx, skipped in events.tolist():
+            normalized_original_word = normalized_originals[word_idx]
+            if event == _EVENT_MISMATCH:
                 logging.warning(
-                    f"Sync warning at word index {word_idx}: LLM token '{normalized_token}' != Original item '{normalized_original_word}'. Attempting to re-sync..."
+                    f"Sync warning at word index {word_idx}: LLM token '{normalized_tokens[token_idx]}' != Original item '{normalized_original_word}'. Attempting to re-sync..."
                 )
-                
-                found_resync = False
-                lookahead_limit = 5 
-                for i in range(1, lookahead_limit + 1):
-                    if (token_idx + i) < len(marked_tokens):
-                        lookahead_token = self._normalize_word(marked_tokens[token_idx + i])
-                        if lookahead_token == normalized_original_word:
-                            logging.warning(f"Re-synced by skipping {i} LLM token(s): '{' '.join(marked_tokens[token_idx:token_idx+i])}'")
-                            token_idx += i
-                            found_resync = True
-                            break
-                
-                if found_resync:
-                    continue
-
+            elif event == _EVENT_RESYNC:
+                logging.warning(f"Re-synced by skipping {skipped} LLM token(s): '{' '.join(marked_tokens[token_idx:token_idx+skipped])}'")
+            else:
                 logging.warning(f"Could not re-sync. Assuming original item '{normalized_original_word}' was omitted by LLM. Skipping it.")
-                word_idx += 1
 
-        if is_inside_cut_segment and current_segment:
-            all_segments.append(current_segment)
+        all_segments = [
+            [original_words[word_idx]['id'] for word_idx in segment.tolist()]
+            for segment in np.split(cut_indices, segment_ends[:-1])
+        ] if len(segment_ends) else []
 
         logging.info(f"Identified {len(all_segments)} cut segments to process.")
         return all_segments
@@ -1,9 +1,84 @@
 # src/services/dataset_generator_service.py
+import io
 import logging
-import json
+import orjson
+import os
+import struct
+import tarfile
+import threading
+import time
 from pathlib import Path
-from pydub import AudioSegment
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Sequence, Tuple, Union, BinaryIO
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# Output file name for each clip in the editor's results.
+AUDIO_OUTPUTS = {
+    "original_audio": "original.wav",
+    "natural_cut_audio": "natural_cut.wav",
+    "backward_invasion_audio": "unnatural_backward.wav",
+    "forward_invasion_audio": "unnatural_forward.wav",
+}
+
+# The canonical 44-byte PCM WAV header, laid out as the `wave` module writes it.
+_WAV_HEADER = struct.Struct('<4sL4s4sLHHLLHH4sL')
+
+def _wav_header(channels: int, sample_width: int, frame_rate: int, n_frames: int) -> bytes:
+    data_length = n_frames * channels * sample_width
+    return _WAV_HEADER.pack(b'RIFF', 36 + data_length, b'WAVE', b'fmt ', 16, 1, channels, frame_rate,
+                            channels * frame_rate * sample_width, channels * sample_width, sample_width * 8,
+                            b'data', data_length)
+
+def _write_parts(parts: List[memoryview], path: Path):
+    """
+    Writes the buffers to `path` with vectored writes, normally a single writev()
+    for the whole file, falling back to sequential writes where writev is unavailable.
+    """
+    if not hasattr(os, 'writev'):
+        with open(path, 'wb') as f:
+            for part in parts:
+                f.write(part)
+        return
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        parts = [part for part in parts if part.nbytes]
+        while parts:
+            written = os.writev(fd, parts)
+            # Drop the buffers writev fully consumed and resume inside a partial one.
+            while parts and written >= parts[0].nbytes:
+                written -= parts.pop(0).nbytes
+            if parts:
+                parts[0] = parts[0][written:]
+    finally:
+        os.close(fd)
+
+def _write_wav(pcm: np.ndarray, frame_rate: int, frame_ranges: Sequence[Tuple[int, int]],
+               destination: Union[Path, BinaryIO]):
+    """
+    Writes the given [start, end) frame ranges of a 16-bit (or wider) PCM array back to
+    back as one WAV file (a path or an open binary file): the header and the array
+    slices go out as one vectored write, without copying the samples. Frames past the
+    end of `pcm` are written as silence, matching the padding pydub adds when a clip is
+    sliced past the end of the file. The editor's clips are always int16; 8-bit WAV
+    would need pydub's unsigned bias.
+    """
+    channels, sample_width = pcm.shape[1], pcm.dtype.itemsize
+    # A cut at the very start or end of a clip leaves an empty range; it adds no frames.
+    frame_ranges = [(start, end) for start, end in frame_ranges if end > start]
+    n_frames = sum(end - start for start, end in frame_ranges)
+    parts = [memoryview(_wav_header(channels, sample_width, frame_rate, n_frames))]
+    for start, end in frame_ranges:
+        # memoryview can't cast an empty slice, so only the in-bounds part is viewed.
+        stop = min(end, len(pcm))
+        if start < stop:
+            parts.append(memoryview(pcm[start:stop]).cast('B'))
+        if end > len(pcm):
+            parts.append(memoryview(bytes((end - max(start, len(pcm))) * channels * sample_width)))
+    if hasattr(destination, 'write'):
+        for part in parts:
+            destination.write(part)
+    else:
+        _write_parts(parts, destination)
 
 class DatasetGeneratorService:
     """
@@ -13,6 +88,80 @@ class DatasetGeneratorService:
     def __init__(self, config: Dict[str, Any]):
         logging.info("DatasetGeneratorService initialized.")
         self.output_dir = Path(config.get('output_dataset_path', 'output_dataset'))
+        # Cuts per tar shard. 0 keeps the one-directory-per-cut layout; otherwise every
+        # cut is appended to output_dir/shard_NNNNNN.tar, which avoids creating tens of
+        # thousands of small files for long recordings.
+        self.shard_size = config.get('dataset_shard_size', 0)
+        # Several files are edited concurrently, so shard writes are serialized.
+        self._shard_lock = threading.Lock()
+        self._shard = None
+        self._shard_path = None
+        self._cuts_in_shard = 0
+        # Each run starts a new shard after the highest existing one rather than appending
+        # to (or, if the numbering has gaps, overwriting) a previous run's.
+        self._next_shard_id = self._last_shard_id() + 1 if self.shard_size else 0
+        # With metadata_manifest enabled, each cut's metadata becomes one line of
+        # output_dir/manifest.jsonl (one buffered stream) instead of a metadata.json.
+        self.metadata_manifest = config.get('metadata_manifest', False)
+        self._manifest_lock = threading.Lock()
+        self._manifest = None
+
+    def _last_shard_id(self) -> int:
+        """Returns the highest id among the existing shard_NNNNNN.tar files, or -1 if there are none."""
+        ids = [int(path.stem[len('shard_'):]) for path in self.output_dir.glob('shard_*.tar')
+               if path.stem[len('shard_'):].isdigit()]
+        return max(ids, default=-1)
+
+    def _append_to_manifest(self, metadata: Dict[str, Any]):
+        line = orjson.dumps(metadata, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+        with self._manifest_lock:
+            if self._manifest is None:
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                self._manifest = open(self.output_dir / "manifest.jsonl", 'ab', buffering=1 << 20)
+            self._manifest.write(line)
+
+    def _add_to_shard(self, prefix: str, edit_results: Dict, metadata_bytes: bytes = None) -> Path:
+        """Appends one cut's clips (and metadata, if given) under `prefix/` in the current shard."""
+        members = []
+        for result_key, file_name in AUDIO_OUTPUTS.items():
+            buffer = io.BytesIO()
+            _write_wav(edit_results["source_pcm"], edit_results["frame_rate"], edit_results[result_key], buffer)
+            members.append((file_name, buffer.getvalue()))
+        if metadata_bytes is not None:
+            members.append(("metadata.json", metadata_bytes))
+
+        with self._shard_lock:
+            if self._shard is None:
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                self._shard_path = self.output_dir / f"shard_{self._next_shard_id:06d}.tar"
+                self._shard = tarfile.open(self._shard_path, 'w')
+                self._next_shard_id += 1
+            for file_name, data in members:
+                info = tarfile.TarInfo(name=f"{prefix}/{file_name}")
+                info.size = len(data)
+                info.mtime = int(time.time())
+                self._shard.addfile(info, io.BytesIO(data))
+            self._shard.fileobj.flush()
+            shard_path = self._shard_path
+            self._cuts_in_shard += 1
+            if self._cuts_in_shard >= self.shard_size:
+                self._close_shard()
+        return shard_path
+
+    def _close_shard(self):
+        if self._shard is not None:
+            self._shard.close()
+            self._shard = None
+            self._cuts_in_shard = 0
+
+    def close(self):
+        """Finishes the open tar shard and manifest, if any. Call once after the last cut is saved."""
+        with self._shard_lock:
+            self._close_shard()
+        with self._manifest_lock:
+            if self._manifest is not None:
+                self._manifest.close()
+                self._manifest = None
 
     def run(self,
             source_audio_name: str,
@@ -24,33 +173,26 @@ class DatasetGeneratorService:
         """
         Saves the four audio files and the metadata.json file.
         """
-        run_output_dir = self.output_dir / source_audio_name / f"cut_{cut_id}"
-        run_output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Save audio files
-        edit_results["original_audio"].export(run_output_dir / "original.wav", format="wav")
-        edit_results["natural_cut_audio"].export(run_output_dir / "natural_cut.wav", format="wav")
-        edit_results["backward_invasion_audio"].export(run_output_dir / "unnatural_backward.wav", format="wav")
-        edit_results["forward_invasion_audio"].export(run_output_dir / "unnatural_forward.wav", format="wav")
-        
-        content_words = [w for w in chunk_words if w.get('type') != 'spacing']
-        word_texts = [w.get('text', '') for w in content_words]
-        word_ids_in_chunk = [w.get('id') for w in content_words]
+        # One pass over the chunk collects the non-spacing texts and the first position
+        # of each word id, so both ends of the cut are found without scanning again.
+        word_texts = []
+        index_in_chunk = {}
+        for w in chunk_words:
+            if w.get('type') != 'spacing':
+                index_in_chunk.setdefault(w.get('id'), len(word_texts))
+                word_texts.append(w.get('text', ''))
         
         marked_text = " ".join(word_texts) 
         try:
-            start_idx_in_chunk = word_ids_in_chunk.index(cut_word_ids[0])
-            end_idx_in_chunk = word_ids_in_chunk.index(cut_word_ids[-1])
-            final_parts = []
-            for i, text in enumerate(word_texts):
-                if i == start_idx_in_chunk:
-                    final_parts.append('<cut>')
-                final_parts.append(text)
-                if i == end_idx_in_chunk:
-                    final_parts.append('</cut>')
-            marked_text = " ".join(final_parts)
+            start_idx_in_chunk = index_in_chunk[cut_word_ids[0]]
+            end_idx_in_chunk = index_in_chunk[cut_word_ids[-1]]
+            marked_text = " ".join(
+                word_texts[:start_idx_in_chunk] + ['<cut>'] +
+                word_texts[start_idx_in_chunk:end_idx_in_chunk + 1] + ['</cut>'] +
+                word_texts[end_idx_in_chunk + 1:]
+            )
             marked_text = marked_text.replace(" <cut> ", " <cut>").replace(" </cut> ", "</cut> ")
-        except ValueError:
+        except KeyError:
             logging.error(f"For cut {cut_id}, could not find all cut word IDs within the provided chunk words.")
 
         metadata = {
@@ -81,8 +223,31 @@ class DatasetGeneratorService:
             }
         }
         
-        with open(run_output_dir / "metadata.json", 'w') as f:
-            json.dump(metadata, f, indent=4)
+        if self.metadata_manifest:
+            self._append_to_manifest(metadata)
+            metadata_bytes = None
+        else:
+            # Serialize in memory and write once; json.dump would issue a write per token.
+            metadata_bytes = orjson.dumps(metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+
+        if self.shard_size:
+            shard_path = self._add_to_shard(f"{source_audio_name}/cut_{cut_id}", edit_results, metadata_bytes)
+            logging.info(f"Saved datapoint for cut {cut_id} to {shard_path}")
+            return
+
+        run_output_dir = self.output_dir / source_audio_name / f"cut_{cut_id}"
+        run_output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Save audio files. The four writes are independent and spend their time in file
+        # I/O, so they overlap on threads; list() re-raises the first failed write.
+        with ThreadPoolExecutor(max_workers=len(AUDIO_OUTPUTS)) as pool:
+            list(pool.map(
+                lambda item: _write_wav(edit_results["source_pcm"], edit_results["frame_rate"], edit_results[item[0]], run_output_dir / item[1]),
+                AUDIO_OUTPUTS.items()
+            ))
+
+        if metadata_bytes is not None:
+            (run_output_dir / "metadata.json").write_bytes(metadata_bytes)
         
         logging.info(f"Saved datapoint for cut {cut_id} to {run_output_dir}")
 
@@ -1,35 +1,20 @@
 # src/services/llm_cut_selector_service.py
 import logging
-import json
+import orjson
+import re
 import requests
-from typing import Dict, Any
+from typing import Dict, Any, List
+from src.utils.http_session import make_session
 
 class LLMCutSelectorService:
     """
     A service that uses an LLM to identify and tag segments for removal
     from a transcript.
     """
-    def __init__(self, api_key: str):
-        print("LLMCutSelectorService initialized.")
-        if not api_key or "YOUR_LLM_API_KEY_HERE" in api_key:
-            raise ValueError("LLM API key is not configured in config.yaml.")
-        self.api_key = api_key
-        self.url = f'https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={self.api_key}'
-
-    def run(self, transcript: str) -> str:
-        """
-        Sends the transcript to the LLM and returns the marked-up version.
-
-        Args:
-            transcript: The full text transcript of the audio.
-
-        Returns:
-            The transcript with segments wrapped in <cut>...</cut> tags.
-        """
-        logging.info("Requesting cut selection from LLM...")
-        
-        # --- FIX: Restored the prompt to your original, complete version ---
-        prompt = f"""
+    # --- FIX: Restored the prompt to your original, complete version ---
+    # Only the transcript changes between calls, so the prompt is kept as a fixed
+    # prefix/suffix around it.
+    _PROMPT_RULES = """
 You are an expert audio editor functioning as a precise API.
 
 Your task is to identify all filler words, repeated words, self-corrections, and verbal tics in the provided transcript. You will mark these segments for deletion.
@@ -61,31 +46,111 @@ Your task is to identify all filler words, repeated words, self-corrections, and
 
 ---
 
-**FINAL TASK:**
+"""
+    _PROMPT_PREFIX = _PROMPT_RULES + """**FINAL TASK:**
 
 Apply these rules to the following transcript. Remember to only return the modified text.
 
 **Transcript:**
-`{transcript}`
+`"""
+    _PROMPT_SUFFIX = "`\n"
+    # Several transcripts share one request by being wrapped in numbered envelopes that
+    # the model must echo back around each modified text.
+    _BATCH_TASK = """**FINAL TASK:**
+
+Apply these rules to each of the following transcripts independently. Each transcript is wrapped between a `===T<number>_BEGIN===` line and a matching `===T<number>_END===` line. Return every modified transcript wrapped in the same envelope lines, with the same number, and nothing else.
+
+**Transcripts:**
 """
-        headers = {'Content-Type': 'application/json'}
-        data = {
-            "contents": [{"parts": [{"text": prompt}]}],
-            "generationConfig": {"temperature": 0.0}
-        }
+    _BATCH_ENVELOPE = re.compile(r'===T(\d+)_BEGIN===\n(.*?)\n===T\1_END===', re.DOTALL)
+    # The request body is pre-serialized around the JSON-encoded prompt string.
+    _BODY_PREFIX = b'{"contents":[{"parts":[{"text":'
+    _BODY_SUFFIX = b'}]}],"generationConfig":{"temperature":0.0}}'
+
+    def __init__(self, api_key: str):
+        print("LLMCutSelectorService initialized.")
+        if not api_key or "YOUR_LLM_API_KEY_HERE" in api_key:
+            raise ValueError("LLM API key is not configured in config.yaml.")
+        self.api_key = api_key
+        self.url = f'https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:streamGenerateContent?alt=sse&key={self.api_key}'
+        # One keep-alive session for every file; the JSON body is in memory, so
+        # rate-limit and 5xx responses can be retried by the transport itself.
+        self.session = make_session(pool_size=8, retry_statuses=True)
+
+    def run(self, transcript: str) -> str:
+        """
+        Sends the transcript to the LLM and returns the marked-up version.
+
+        Args:
+            transcript: The full text transcript of the audio.
+
+        Returns:
+            The transcript with segments wrapped in <cut>...</cut> tags.
+        """
+        logging.info("Requesting cut selection from LLM...")
+        marked_transcript = self._generate(self._PROMPT_PREFIX + transcript + self._PROMPT_SUFFIX)
+        logging.info("Successfully received marked transcript from LLM.")
+        return marked_transcript
+
+    def run_batch(self, transcripts: List[str]) -> List[str]:
+        """
+        Marks up several transcripts with a single LLM request, which amortizes the
+        connection and per-request overhead when the transcripts are short.
+
+        Args:
+            transcripts: The text transcripts to process.
+
+        Returns:
+            The marked-up transcripts, in the same order as the input.
+        """
+        if not transcripts:
+            return []
+        logging.info(f"Requesting cut selection from LLM for a batch of {len(transcripts)} transcripts...")
+        prompt = self._PROMPT_RULES + self._BATCH_TASK + ''.join(
+            f"===T{i}_BEGIN===\n{transcript}\n===T{i}_END===\n" for i, transcript in enumerate(transcripts))
+        response_text = self._generate(prompt)
+
+        marked = {}
+        for match in self._BATCH_ENVELOPE.finditer(response_text):
+            marked.setdefault(int(match.group(1)), match.group(2))
+        missing = [i for i in range(len(transcripts)) if i not in marked]
+        if missing:
+            logging.error(f"LLM batch response is missing transcripts {missing}.")
+            raise ValueError("Could not parse LLM response.")
+        logging.info("Successfully received marked transcripts from LLM.")
+        return [marked[i] for i in range(len(transcripts))]
+
+    def _generate(self, prompt: str) -> str:
+        """Sends one prompt to the LLM and returns the concatenated response text."""
+        body = self._BODY_PREFIX + orjson.dumps(prompt) + self._BODY_SUFFIX
 
+        # The response is streamed as server-sent events, each 'data:' line holding one
+        # partial GenerateContentResponse, so the text is read as it is generated and the
+        # read timeout only bounds the gap between chunks rather than the whole answer.
+        event = b''
         try:
-            response = requests.post(self.url, headers=headers, data=json.dumps(data))
-            response.raise_for_status()
-            response_json = response.json()
-            marked_transcript = response_json['candidates'][0]['content']['parts'][0]['text']
-            logging.info("Successfully received marked transcript from LLM.")
-            return marked_transcript
+            with self.session.post(self.url, data=body, headers={'Content-Type': 'application/json'},
+                                   stream=True, timeout=(10, 120)) as response:
+                response.raise_for_status()
+                text_parts = []
+                for line in response.iter_lines():
+                    if not line.startswith(b'data:'):
+                        continue
+                    event = line[len(b'data:'):].strip()
+                    if event == b'[DONE]':
+                        break
+                    candidate = orjson.loads(event)['candidates'][0]
+                    # The closing event may carry only a finishReason.
+                    text_parts.extend(part.get('text', '') for part in candidate.get('content', {}).get('parts', []))
+            if not text_parts:
+                logging.error(f"LLM response stream contained no text. Last event was: {event.decode('utf-8', 'replace')}")
+                raise ValueError("Could not parse LLM response.")
+            return ''.join(text_parts)
         except requests.exceptions.RequestException as e:
             logging.error(f"API request to LLM failed: {e}", exc_info=True)
             raise
-        except (KeyError, IndexError) as e:
+        except (KeyError, IndexError, orjson.JSONDecodeError) as e:
             logging.error(f"Failed to parse LLM response: {e}", exc_info=True)
-            logging.error(f"Raw response was: {response.text}")
+            logging.error(f"Last response event was: {event.decode('utf-8', 'replace')}")
             raise ValueError("Could not parse LLM response.")
         
\ No newline at end of file
@@ -1,8 +1,10 @@
 # src/services/mfa_aligner_service.py
+import os
 import subprocess
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 import shutil
 
 from src.utils.mfa_text_normalizer import normalize_text_for_mfa
@@ -18,6 +20,8 @@ class MfaAlignerService:
         self.num_jobs = self.mfa_config.get('num_jobs', 1)
         self.dictionary_name = self.mfa_config.get('dictionary_name')
         self.acoustic_model_name = self.mfa_config.get('acoustic_model_name')
+        # Chunks per concurrent `mfa align` run; 0 aligns everything in one run.
+        self.shard_size = self.mfa_config.get('shard_size', 0)
 
     def run(self, mfa_chunks_dir: Path, audio_chunks_dir: Path) -> Path:
         """
@@ -35,11 +39,62 @@ class MfaAlignerService:
         output_dir = mfa_chunks_dir / "mfa_output"
         if output_dir.exists():
             shutil.rmtree(output_dir) # Clean up previous runs
-        
+
+        lab_paths = sorted(mfa_chunks_dir.glob("*.lab"))
+        if self.shard_size and len(lab_paths) > self.shard_size:
+            shard_dirs = self._partition(lab_paths, audio_chunks_dir, mfa_chunks_dir)
+            return self.run_sharded(shard_dirs, output_dir)
+
+        self._run_one_shard(mfa_chunks_dir, output_dir)
+        return output_dir
+
+    def _partition(self, lab_paths: List[Path], audio_chunks_dir: Path, shards_root: Path) -> List[Path]:
+        """Moves the chunks into sub-directories of at most `shard_size` chunks each."""
+        shard_dirs = []
+        for start in range(0, len(lab_paths), self.shard_size):
+            # MFA keys its working files by corpus directory name, so shard names must be
+            # unique across files aligned at the same time.
+            shard_dir = shards_root / f"{shards_root.name}_shard{len(shard_dirs)}"
+            shard_dir.mkdir()
+            for lab_path in lab_paths[start:start + self.shard_size]:
+                shutil.move(str(lab_path), shard_dir / lab_path.name)
+                wav_path = audio_chunks_dir / f"{lab_path.stem}.wav"
+                shutil.move(str(wav_path), shard_dir / wav_path.name)
+            shard_dirs.append(shard_dir)
+        return shard_dirs
+
+    def run_sharded(self, mfa_chunks_dirs: List[Path], output_dir: Path) -> Path:
+        """
+        Aligns each shard with its own concurrent `mfa align` invocation and merges the
+        TextGrid outputs into `output_dir`.
+
+        Args:
+            mfa_chunks_dirs: One corpus directory per shard, each holding its .lab transcript
+                files and the matching .wav audio chunks.
+            output_dir: The directory the merged TextGrid files are moved into.
+
+        Returns:
+            The path to the directory containing the output TextGrid files.
+        """
+        workers = max(1, min(len(mfa_chunks_dirs), (os.cpu_count() or 1) // self.num_jobs))
+        logging.info(f"Aligning {len(mfa_chunks_dirs)} MFA shards with {workers} concurrent runs.")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        # Each worker only waits on its `mfa` subprocess, so threads are enough here.
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self._run_one_shard, mfa_dir, mfa_dir / "mfa_output") for mfa_dir in mfa_chunks_dirs]
+            shard_outputs = [future.result() for future in futures]
+        for shard_output in shard_outputs:
+            for textgrid_path in shard_output.glob("*.TextGrid"):
+                shutil.move(str(textgrid_path), output_dir / textgrid_path.name)
+        logging.info("Sharded MFA alignment completed successfully.")
+        return output_dir
+
+    def _run_one_shard(self, corpus_dir: Path, output_dir: Path) -> Path:
+        """Runs a single `mfa align` over `corpus_dir`, writing TextGrids to `output_dir`."""
         # The `mfa align` command
         # Using --clean flag to ensure a fresh run
         mfa_command = [
-            "mfa", "align", str(mfa_chunks_dir),
+            "mfa", "align", str(corpus_dir),
             self.dictionary_name,
             self.acoustic_model_name,
             str(output_dir),
@@ -50,17 +105,14 @@ class MfaAlignerService:
 
         logging.info(f"Executing MFA command: {' '.join(mfa_command)}")
 
+        # MFA's output goes straight to log files next to the output directory instead of
+        # being buffered in memory; only their tails are read back if the run fails.
+        stdout_path = output_dir.parent / "mfa.stdout.log"
+        stderr_path = output_dir.parent / "mfa.stderr.log"
         try:
-            # We use capture_output=True to get stdout/stderr
-            process = subprocess.run(
-                mfa_command,
-                check=True,
-                capture_output=True,
-                text=True,
-                encoding='utf-8'
-            )
-            logging.info("MFA process stdout:\n" + process.stdout)
-            logging.info("MFA alignment completed successfully.")
+            with open(stdout_path, 'wb') as stdout_file, open(stderr_path, 'wb') as stderr_file:
+                subprocess.run(mfa_command, check=True, stdout=stdout_file, stderr=stderr_file)
+            logging.info(f"MFA alignment completed successfully (log: {stdout_path}).")
             return output_dir
             
         except FileNotFoundError:
@@ -68,7 +120,14 @@ class MfaAlignerService:
             raise
         except subprocess.CalledProcessError as e:
             logging.error(f"MFA process failed with exit code {e.returncode}.")
-            logging.error("MFA Stderr:\n" + e.stderr)
-            logging.error("MFA Stdout:\n" + e.stdout)
+            logging.error("MFA Stderr:\n" + self._read_log_tail(stderr_path))
+            logging.error("MFA Stdout:\n" + self._read_log_tail(stdout_path))
             raise e
+
+    @staticmethod
+    def _read_log_tail(log_path: Path, max_bytes: int = 64 * 1024) -> str:
+        """Returns the last `max_bytes` of a log file, decoded leniently."""
+        with open(log_path, 'rb') as log_file:
+            log_file.seek(max(0, log_path.stat().st_size - max_bytes))
+            return log_file.read().decode('utf-8', 'replace')
         
\ No newline at end of file
@@ -1,4 +1,5 @@
 # src/services/mfa_chunker_service.py
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Any
 import logging
@@ -8,14 +9,21 @@ class MfaChunkerService:
     Creates audio chunks for MFA based on eligible split points and Scribe's
     silence detection.
     """
+    # The split-point columns this service reads, so cached tables can be loaded projected.
+    SPLIT_POINT_COLUMNS = ['split_point_ms']
+
     def __init__(self):
         logging.info("MfaChunkerService initialized.")
 
-    def _find_word_at_time(self, scribe_data: Dict[str, Any], time_s: float) -> Dict[str, Any]:
-        """Finds the word/spacing object in scribe data at a specific time."""
-        for word in scribe_data.get('words', []):
-            if word['start'] <= time_s <= word['end']:
-                return word
+    def _find_word_at_time(self, words: List[Dict[str, Any]], starts: np.ndarray, ends: np.ndarray, time_s: float) -> Dict[str, Any]:
+        """
+        Finds the word/spacing object in scribe data at a specific time. Scribe's words
+        are sorted and don't overlap, so the first one ending at or after `time_s` is
+        the only candidate.
+        """
+        i = int(np.searchsorted(ends, time_s, side='left'))
+        if i < len(words) and starts[i] <= time_s <= ends[i]:
+            return words[i]
         return None
 
     def run(self, 
@@ -34,58 +42,56 @@ class MfaChunkerService:
             eligible_split_points_s.append(total_duration_s)
         eligible_split_points_s.sort()
 
+        words = scribe_data.get('words', [])
+        starts = np.fromiter((w['start'] for w in words), dtype=np.float64, count=len(words))
+        ends = np.fromiter((w['end'] for w in words), dtype=np.float64, count=len(words))
+        is_audio_event = np.fromiter((w.get('type') == 'audio_event' for w in words), dtype=bool, count=len(words))
+        is_transcript_word = np.fromiter((w.get('type') == 'word' and w.get('text') != '...' for w in words), dtype=bool, count=len(words))
+
         current_start_s = 0.0
         
-        while current_start_s < total_duration_s:
-            found_chunk_end = False
-            
-            for split_point_s in eligible_split_points_s:
-                if split_point_s <= current_start_s:
-                    continue
+        # The split points are sorted, so a single sweep visits them in order: every point
+        # passed over before a chunk boundary lies before that boundary and would only be
+        # skipped again if the scan restarted.
+        for split_point_s in eligible_split_points_s:
+            if current_start_s >= total_duration_s:
+                break
 
-                if (split_point_s - current_start_s) * 1000 < min_duration_ms and split_point_s != total_duration_s:
-                    continue
+            if split_point_s <= current_start_s:
+                continue
 
-                word_at_split = self._find_word_at_time(scribe_data, split_point_s)
-                is_last_point = (split_point_s >= total_duration_s)
+            if (split_point_s - current_start_s) * 1000 < min_duration_ms and split_point_s != total_duration_s:
+                continue
 
-                if (word_at_split and word_at_split.get('type') == 'spacing') or is_last_point:
-                    current_end_s = split_point_s
-                    
-                    chunk_scribe_words = []
-                    transcript_parts = []
-                    # --- MODIFICATION START: Detect audio events in the chunk ---
-                    contains_audio_event = False
-                    for word_obj in scribe_data['words']:
-                        if word_obj['start'] < current_end_s and word_obj['end'] > current_start_s:
-                            chunk_scribe_words.append(word_obj)
-                            if word_obj.get('type') == 'audio_event':
-                                contains_audio_event = True
-                            
-                            if word_obj.get('type') == 'word' and word_obj.get('text') != '...':
-                                transcript_parts.append(word_obj['text'])
-                    # --- MODIFICATION END ---
-                    
-                    if not transcript_parts: 
-                        current_start_s = current_end_s
-                        found_chunk_end = True
-                        break
-
-                    mfa_chunks.append({
-                        "id": len(mfa_chunks),
-                        "start_s": current_start_s,
-                        "end_s": current_end_s,
-                        "transcript": " ".join(transcript_parts),
-                        "scribe_words": chunk_scribe_words,
-                        "contains_audio_event": contains_audio_event # <-- Add the flag
-                    })
-                    
-                    current_start_s = current_end_s
-                    found_chunk_end = True
-                    break
+            word_at_split = self._find_word_at_time(words, starts, ends, split_point_s)
+            is_last_point = (split_point_s >= total_duration_s)
 
-            if not found_chunk_end:
-                break
+            if not ((word_at_split and word_at_split.get('type') == 'spacing') or is_last_point):
+                continue
+
+            current_end_s = split_point_s
+            
+            # The words overlapping [current_start_s, current_end_s) are a contiguous
+            # run: those ending after the start and starting before the end.
+            lo = int(np.searchsorted(ends, current_start_s, side='right'))
+            hi = max(lo, int(np.searchsorted(starts, current_end_s, side='left')))
+            chunk_scribe_words = words[lo:hi]
+            transcript_indices = np.flatnonzero(is_transcript_word[lo:hi]) + lo
+            # --- MODIFICATION START: Detect audio events in the chunk ---
+            contains_audio_event = bool(is_audio_event[lo:hi].any())
+            # --- MODIFICATION END ---
+            
+            if transcript_indices.size: 
+                mfa_chunks.append({
+                    "id": len(mfa_chunks),
+                    "start_s": current_start_s,
+                    "end_s": current_end_s,
+                    "transcript": " ".join(words[i]['text'] for i in transcript_indices),
+                    "scribe_words": chunk_scribe_words,
+                    "contains_audio_event": contains_audio_event # <-- Add the flag
+                })
+            
+            current_start_s = current_end_s
         
         logging.info(f"Defined {len(mfa_chunks)} chunks for MFA.")
         return mfa_chunks
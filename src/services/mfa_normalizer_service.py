@@ -1,7 +1,9 @@
 # src/services/mfa_normalizer_service.py
 from pathlib import Path
-import textgrid
+import gridio
 import logging
+import operator
+import numpy as np
 from typing import List, Dict, Any
 
 from src.utils.mfa_text_normalizer import normalize_text_for_mfa
@@ -14,28 +16,53 @@ class MfaNormalizerService:
     def __init__(self):
         logging.info("MfaNormalizerService initialized.")
 
+    # Word-tier labels MFA uses for silence and unknown speech rather than words.
+    _NON_WORD_MARKS = ['sp', 'spn', 'sil']
+
     def _parse_textgrid(self, tg_path: Path, offset_s: float, original_words: List[Dict], is_reliable: bool) -> List[Dict[str, Any]]:
         """Parses a single TextGrid file and maps aligned words to original scribe words."""
         aligned_words = []
         try:
-            tg = textgrid.TextGrid.fromFile(str(tg_path))
-            word_tier = tg.getFirst('words')
-            phone_tier = tg.getFirst('phones')
+            # gridio parses the file in Rust straight into one table of intervals
+            # (tmin, tmax, label, tier), without building an object per interval.
+            intervals = gridio.textgrid_to_df(str(tg_path))
+            word_tier = intervals[intervals['tier'] == 'words']
+            phone_tier = intervals[intervals['tier'] == 'phones']
 
-            if not word_tier:
+            if word_tier.empty:
                 logging.error(f"'words' tier not found in {tg_path.name}")
                 return []
-            if not phone_tier:
+            if phone_tier.empty:
                 logging.warning(f"'phones' tier not found in {tg_path.name}. Phonemes will be empty.")
 
+            word_labels = word_tier['label'].fillna('')
+            word_tier = word_tier[(word_labels != '') & ~word_labels.str.lower().isin(self._NON_WORD_MARKS)]
+            phone_tier = phone_tier[phone_tier['label'].fillna('').str.strip() != '']
+            # The times keep the 5-decimal rounding the `textgrid` package applied on read,
+            # so the normalized timings are unchanged.
+            phone_min = np.array([round(t, 5) for t in phone_tier['tmin'].tolist()], dtype=np.float64)
+            phone_max = np.array([round(t, 5) for t in phone_tier['tmax'].tolist()], dtype=np.float64)
+            phone_labels = phone_tier['label'].tolist()
+            word_min = np.array([round(t, 5) for t in word_tier['tmin'].tolist()], dtype=np.float64)
+            word_max = np.array([round(t, 5) for t in word_tier['tmax'].tolist()], dtype=np.float64)
+            # Absolute times for every word and phone of the chunk, shifted and rounded in
+            # one array pass each.
+            word_starts = np.round(word_min + offset_s, 4).tolist()
+            word_ends = np.round(word_max + offset_s, 4).tolist()
+            phone_starts = np.round(phone_min + offset_s, 4).tolist()
+            phone_ends = np.round(phone_max + offset_s, 4).tolist()
+
             # Filter original_words to only include those that should be in the TextGrid
             mfa_input_words = [w for w in original_words if w.get('type') == 'word' and w.get('text') != '...']
             
+            # Both tiers are sorted runs of intervals, so the phones inside [start, end] are
+            # the contiguous block from the first phone starting at or after `start` to the
+            # last one ending at or before `end`.
+            first_phone = np.searchsorted(phone_min, word_min, side='left').tolist()
+            phone_stop = np.searchsorted(phone_max, word_max, side='right').tolist()
+
             original_word_idx = 0
-            for interval in word_tier:
-                if not interval.mark or interval.mark.lower() in ['sp', 'spn', 'sil']:
-                    continue
-                
+            for start, end, lo, hi in zip(word_starts, word_ends, first_phone, phone_stop):
                 if original_word_idx >= len(mfa_input_words):
                     logging.warning("MFA produced more words than in original transcript, skipping extra.")
                     break
@@ -46,22 +73,16 @@ class MfaNormalizerService:
                 word_data = {
                     "id": original_word['id'],
                     "word": original_word['text'],
-                    "start": round(interval.minTime + offset_s, 4),
-                    "end": round(interval.maxTime + offset_s, 4),
+                    "start": start,
+                    "end": end,
                     "is_timestamp_reliable": is_reliable, # <-- Add the flag here
-                    "phonemes": []
+                    # The word's phonemes as three parallel columns (slices of the chunk's
+                    # phone lists) rather than one dict per phoneme.
+                    "phonemes_text": phone_labels[lo:hi],
+                    "phonemes_start": phone_starts[lo:hi],
+                    "phonemes_end": phone_ends[lo:hi]
                 }
                 # --- MODIFICATION END ---
-
-                if phone_tier:
-                    for p_interval in phone_tier:
-                        if p_interval.minTime >= interval.minTime and p_interval.maxTime <= interval.maxTime:
-                            if p_interval.mark and p_interval.mark.strip():
-                                word_data["phonemes"].append({
-                                    "text": p_interval.mark,
-                                    "start": round(p_interval.minTime + offset_s, 4),
-                                    "end": round(p_interval.maxTime + offset_s, 4)
-                                })
                 
                 aligned_words.append(word_data)
                 original_word_idx += 1
@@ -77,14 +98,17 @@ class MfaNormalizerService:
         all_words = []
         
         chunk_map = {chunk['id']: chunk for chunk in mfa_chunks}
-        textgrid_files = sorted(mfa_output_dir.glob("*.TextGrid"), key=lambda p: int(p.stem.split('_')[-1]))
-
-        for tg_file in textgrid_files:
+        # Each file's chunk id is parsed once and the files are sorted by it; names
+        # without a numeric suffix are skipped.
+        textgrid_files = []
+        for tg_file in mfa_output_dir.glob("*.TextGrid"):
             try:
-                chunk_id = int(tg_file.stem.split('_')[-1])
-            except (ValueError, IndexError):
+                textgrid_files.append((int(tg_file.stem.rpartition('_')[2]), tg_file))
+            except ValueError:
                 continue
-                
+        textgrid_files.sort(key=operator.itemgetter(0))
+
+        for chunk_id, tg_file in textgrid_files:
             chunk_info = chunk_map.get(chunk_id)
             if not chunk_info:
                 continue
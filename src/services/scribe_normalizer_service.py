@@ -29,34 +29,32 @@ class ScribeNormalizerService:
         }
 
         full_text_parts = []
+        words = master_transcript['words']
+        chunk_start_offsets_s = (chunk_df['chunk_start_ms'].to_numpy() / 1000.0).tolist()
 
         for i, result in enumerate(scribe_results):
-            chunk_start_offset_s = chunk_df.iloc[i]['chunk_start_ms'] / 1000.0
+            chunk_start_offset_s = chunk_start_offsets_s[i]
             
             # Append the full text from the chunk
             full_text_parts.append(result.get('text', ''))
 
-            # Process each word/event item in the chunk's result
+            # Process each word/event item in the chunk's result. Each normalized item is
+            # built as one new dict (leaving the original untouched) with its timestamps
+            # shifted by the chunk's start offset and its unique ID, for consistency with
+            # the reference project, assigned in the same pass.
             for item in result.get('words', []):
-                # Create a copy to avoid modifying the original dict
-                normalized_item = item.copy()
-
                 # --- MODIFICATION START: Reclassify '...' as an 'artifact' ---
-                if normalized_item.get('text') == '...':
-                    normalized_item['type'] = 'artifact'
+                artifact = {'type': 'artifact'} if item.get('text') == '...' else {}
                 # --- MODIFICATION END ---
-                
-                # Adjust timestamps by adding the chunk's start offset
-                normalized_item['start'] = round(item['start'] + chunk_start_offset_s, 3)
-                normalized_item['end'] = round(item['end'] + chunk_start_offset_s, 3)
-                
-                master_transcript['words'].append(normalized_item)
+                words.append({
+                    **item,
+                    **artifact,
+                    'start': round(item['start'] + chunk_start_offset_s, 3),
+                    'end': round(item['end'] + chunk_start_offset_s, 3),
+                    'id': len(words)
+                })
 
         # Join all text parts with a space
         master_transcript['text'] = " ".join(full_text_parts)
 
-        # Add a unique ID to each word object for consistency with the reference project.
-        for i, word in enumerate(master_transcript['words']):
-            word['id'] = i
-
         return master_transcript
@@ -1,9 +1,12 @@
 # src/services/scribe_service.py
 from pathlib import Path
+import orjson
 import requests
 import logging
 from typing import Dict, Any
 
+from src.utils.http_session import make_session, post_multipart_with_retry
+
 class ScribeService:
     """A service for transcribing audio using the ElevenLabs Scribe API."""
     def __init__(self, api_key: str):
@@ -12,14 +15,17 @@ class ScribeService:
             raise ValueError("ElevenLabs API key is not configured in config.yaml.")
         self.api_key = api_key
         self.url = 'https://api.elevenlabs.io/v1/speech-to-text'
+        # One pooled session shared by all transcription workers, so TCP/TLS
+        # connections to the API are reused instead of re-established per chunk.
+        self.session = make_session()
+        self.session.headers.update({'xi-api-key': self.api_key})
 
     def run(self, audio_chunk_path: Path) -> Dict[str, Any]:
         """
         Transcribes a single audio chunk and returns the full JSON response.
         """
         logging.info(f"Requesting Scribe transcription for '{audio_chunk_path.name}'")
-        headers = {'xi-api-key': self.api_key}
-        
+
         # --- FIX ---
         # The model_id is now 'scribe_v1' as specified by the API error and documentation.
         # Added 'diarize' to match the cookbook example's best practice.
@@ -29,13 +35,15 @@ class ScribeService:
         }
 
         try:
-            with open(audio_chunk_path, 'rb') as audio_file:
-                files = {'file': (audio_chunk_path.name, audio_file, 'audio/wav')}
-                response = requests.post(self.url, headers=headers, data=data, files=files)
-                response.raise_for_status()
+            # Streams the multipart body from disk and retries 429/5xx with backoff.
+            response = post_multipart_with_retry(
+                self.session, self.url, data, audio_chunk_path, audio_chunk_path.name, 'audio/wav'
+            )
+            response.raise_for_status()
             
             logging.info(f"Successfully received transcription for '{audio_chunk_path.name}'.")
-            return response.json()
+            # Word-level responses run to several MB; orjson decodes them much faster than json.
+            return orjson.loads(response.content)
         
         except requests.exceptions.RequestException as e:
             if e.response is not None:
@@ -43,4 +51,8 @@ class ScribeService:
             
             logging.error(f"Scribe API request failed for '{audio_chunk_path.name}': {e}", exc_info=False)
             raise e
+
+        except orjson.JSONDecodeError as e:
+            logging.error(f"Scribe API returned an unparsable response for '{audio_chunk_path.name}': {e}")
+            raise
         
\ No newline at end of file
@@ -1,4 +1,5 @@
 # src/services/split_point_service.py
+import numpy as np
 import pandas as pd
 from typing import Dict, Any
 
@@ -25,33 +26,18 @@ class SplitPointService:
         if vad_timestamps_df.empty:
             return pd.DataFrame(columns=['split_point_ms', 'silence_start_ms', 'silence_end_ms'])
 
-        split_points = []
+        starts = vad_timestamps_df['start_ms'].to_numpy(dtype=np.int64)
+        ends = vad_timestamps_df['end_ms'].to_numpy(dtype=np.int64)
 
-        # 1. First split point is always at the beginning
-        split_points.append({
-            'split_point_ms': 0,
-            'silence_start_ms': 0,
-            'silence_end_ms': vad_timestamps_df.iloc[0]['start_ms']
-        })
-
-        # 2. Intermediate split points are in the middle of silences
-        for i in range(len(vad_timestamps_df) - 1):
-            silence_start = vad_timestamps_df.iloc[i]['end_ms']
-            silence_end = vad_timestamps_df.iloc[i+1]['start_ms']
-            mid_point = silence_start + (silence_end - silence_start) / 2
-            
-            split_points.append({
-                'split_point_ms': int(mid_point),
-                'silence_start_ms': silence_start,
-                'silence_end_ms': silence_end
-            })
+        # Intermediate split points are in the middle of silences. Flooring the integer
+        # half-gap matches int() of the exact midpoint, which is never negative.
+        gap_start, gap_end = ends[:-1], starts[1:]
+        mid_points = gap_start + (gap_end - gap_start) // 2
 
-        # 3. Last split point is always at the very end
-        split_points.append({
-            'split_point_ms': total_duration_ms,
-            'silence_start_ms': vad_timestamps_df.iloc[-1]['end_ms'],
-            'silence_end_ms': total_duration_ms
+        # The first split point is always at the beginning and the last at the very end.
+        return pd.DataFrame({
+            'split_point_ms': np.concatenate(([0], mid_points, [total_duration_ms])).astype(np.int64),
+            'silence_start_ms': np.concatenate(([0], gap_start, ends[-1:])).astype(np.int64),
+            'silence_end_ms': np.concatenate((starts[:1], gap_end, [total_duration_ms])).astype(np.int64)
         })
-
-        return pd.DataFrame(split_points)
     
\ No newline at end of file
@@ -1,4 +1,5 @@
 # src/services/transcription_chunker_service.py
+import numpy as np
 import pandas as pd
 
 class TranscriptionChunkerService:
@@ -6,6 +7,9 @@ class TranscriptionChunkerService:
     Uses a list of eligible split points to create chunks for transcription
     that are as long as possible without exceeding a maximum duration.
     """
+    # The split-point columns this service reads, so cached tables can be loaded projected.
+    SPLIT_POINT_COLUMNS = ['split_point_ms']
+
     def __init__(self, max_duration_ms: int = 475000):
         print("TranscriptionChunkerService initialized.")
         self.max_duration_ms = max_duration_ms
@@ -23,33 +27,21 @@ class TranscriptionChunkerService:
         if split_points_df.empty:
             return pd.DataFrame(columns=['chunk_start_ms', 'chunk_end_ms'])
 
-        chunks = []
-        split_points = split_points_df['split_point_ms'].tolist()
+        split_points = split_points_df['split_point_ms'].to_numpy()
         
-        current_chunk_start_index = 0
-        while current_chunk_start_index < len(split_points) - 1:
-            start_time = split_points[current_chunk_start_index]
-            end_index = current_chunk_start_index
-            
-            # Find the furthest split point that is within the max duration
-            for i in range(current_chunk_start_index + 1, len(split_points)):
-                if split_points[i] - start_time <= self.max_duration_ms:
-                    end_index = i
-                else:
-                    break # Stop as soon as we exceed the max duration
-
-            # If no progress was made (e.g., a very long VAD segment), force at least one step
-            if end_index == current_chunk_start_index:
-                end_index += 1
-
-            end_time = split_points[end_index]
-            chunks.append({
-                'chunk_start_ms': start_time,
-                'chunk_end_ms': end_time
-            })
-            
-            # The next chunk starts where the last one ended
-            current_chunk_start_index = end_index
-
-        return pd.DataFrame(chunks)
+        # For every split point, the furthest split point within the max duration. The
+        # points are sorted, so one searchsorted gives the whole jump table.
+        reach = np.searchsorted(split_points, split_points + self.max_duration_ms, side='right') - 1
+        # If no progress can be made (e.g., a very long VAD segment), force at least one step
+        reach = np.maximum(reach, np.arange(1, len(split_points) + 1)).tolist()
+
+        # Each chunk starts where the last one ended
+        boundaries = [0]
+        while boundaries[-1] < len(split_points) - 1:
+            boundaries.append(reach[boundaries[-1]])
+
+        return pd.DataFrame({
+            'chunk_start_ms': split_points[boundaries[:-1]],
+            'chunk_end_ms': split_points[boundaries[1:]]
+        })
     
\ No newline at end of file
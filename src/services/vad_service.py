@@ -1,5 +1,7 @@
 # src/services/vad_service.py
 from pathlib import Path
+import threading
+import numpy as np
 import pandas as pd
 from ..vad_processor import process_audio
 
@@ -9,12 +11,18 @@ class VADService:
         print("VADService initialized.")
         self.model = model
         self.get_speech_timestamps = utils[0]
+        # The Silero ONNX wrapper keeps recurrent state between calls, so only
+        # one file may run through the model at a time.
+        self._lock = threading.Lock()
 
-    def run(self, audio_path: Path) -> pd.DataFrame:
-        """Runs the VAD processing on a given audio file."""
-        return process_audio(
-            audio_path=audio_path,
-            model=self.model,
-            get_speech_timestamps=self.get_speech_timestamps
-        )
+    def run(self, audio_path: Path, pcm: np.ndarray = None, sr: int = None) -> pd.DataFrame:
+        """Runs the VAD processing on a given audio file, reusing its int16 `pcm` at rate `sr` if already decoded."""
+        with self._lock:
+            return process_audio(
+                audio_path=audio_path,
+                model=self.model,
+                get_speech_timestamps=self.get_speech_timestamps,
+                pcm=pcm,
+                sr=sr
+            )
     
\ No newline at end of file
@@ -1,17 +1,25 @@
 # src/utils/config_loader.py
+import functools
 import yaml
 from pathlib import Path
 
+# libyaml's C parser when PyYAML was built with it, the pure-Python one otherwise.
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+@functools.lru_cache(maxsize=1)
 def load_config():
-    """Loads the application configuration from the root config.yaml file."""
+    """
+    Loads the application configuration from the root config.yaml file. The file is
+    read and parsed once per process; later calls return the same dict, so callers
+    should treat it as read-only.
+    """
     config_path = Path(__file__).parent.parent.parent / 'config.yaml'
     if not config_path.exists():
         raise FileNotFoundError(f"Configuration file not found at: {config_path}")
     
     with open(config_path, 'r') as f:
         try:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_SafeLoader)
             return config
         except yaml.YAMLError as e:
             raise ValueError(f"Error parsing YAML file: {e}")
-        
\ No newline at end of file
@@ -0,0 +1,36 @@
+# src/utils/dataframe_io.py
+from pathlib import Path
+from typing import List
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+def read_dataframe(path: Path, columns: List[str] = None) -> pd.DataFrame:
+    """
+    Reads a cached DataFrame, picking the format from the file extension.
+
+    '.feather' files are memory-mapped Arrow IPC, so columns are paged in on demand
+    and keep their exact dtypes. '.parquet' files are read as Parquet. Anything else
+    is treated as CSV and parsed with the pyarrow engine so existing caches keep working.
+
+    `columns` restricts the read to those columns; the columnar formats then skip the
+    other columns' pages entirely.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == '.feather':
+        return feather.read_table(path, columns=columns, memory_map=True).to_pandas(zero_copy_only=False)
+    if suffix == '.parquet':
+        return pd.read_parquet(path, engine='pyarrow', columns=columns)
+    return pd.read_csv(path, engine='pyarrow', usecols=columns)
+
+def write_dataframe(path: Path, df: pd.DataFrame):
+    """Writes a DataFrame cache in the format implied by the file extension."""
+    suffix = Path(path).suffix.lower()
+    if suffix == '.feather':
+        feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), path, compression='zstd')
+        return
+    if suffix == '.parquet':
+        df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+        return
+    with open(path, 'w', buffering=1 << 20, newline='') as f:
+        df.to_csv(f, index=False)
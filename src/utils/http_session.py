@@ -0,0 +1,56 @@
+# src/utils/http_session.py
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
+from urllib3.util import Retry
+
+# Responses worth retrying: rate limiting and transient server-side failures.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def make_session(pool_size: int = 32, retries: int = 5, backoff_factor: float = 0.5,
+                 retry_statuses: bool = False) -> requests.Session:
+    """
+    Builds a requests.Session with a keep-alive connection pool large enough for the
+    concurrent workers. By default urllib3 only retries failed connection attempts,
+    which is safe for POSTs since nothing has been sent yet; status retries are handled
+    by `post_multipart_with_retry`, because a streamed upload can't be replayed.
+
+    With `retry_statuses`, 429/5xx responses are retried by urllib3 as well (honouring
+    Retry-After), for sessions that only send in-memory bodies such as JSON.
+    """
+    session = requests.Session()
+    if retry_statuses:
+        retry = Retry(total=retries, connect=retries, read=0, status=retries, status_forcelist=RETRY_STATUSES,
+                      allowed_methods=None, backoff_factor=backoff_factor, raise_on_status=False)
+    else:
+        retry = Retry(total=retries, connect=retries, read=0, status=0, backoff_factor=backoff_factor)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def post_multipart_with_retry(session: requests.Session, url: str, fields: Dict[str, Any], file_path: Path,
+                              file_name: str, mime_type: str, headers: Dict[str, str] = None,
+                              retries: int = 5, backoff_factor: float = 0.5) -> requests.Response:
+    """
+    POSTs `fields` plus the file at `file_path` as a streamed multipart/form-data body.
+
+    On a 429/5xx response the request is rebuilt from a fresh file handle and retried
+    with exponential backoff (backoff_factor * 2**attempt seconds, or the server's
+    Retry-After when it sends one). The last response is returned either way.
+    """
+    for attempt in range(retries + 1):
+        with open(file_path, 'rb') as audio_file:
+            encoder = MultipartEncoder(fields={**fields, 'file': (file_name, audio_file, mime_type)})
+            response = session.post(url, data=encoder, headers={**(headers or {}), 'Content-Type': encoder.content_type})
+        if response.status_code not in RETRY_STATUSES or attempt == retries:
+            return response
+        retry_after = response.headers.get('Retry-After', '')
+        delay = float(retry_after) if retry_after.isdigit() else backoff_factor * (2 ** attempt)
+        logging.warning(f"{url} returned {response.status_code} for '{file_name}'; retrying in {delay:.1f}s ({attempt + 1}/{retries}).")
+        time.sleep(delay)
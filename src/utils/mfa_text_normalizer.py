@@ -1,6 +1,23 @@
 # src/utils/mfa_text_normalizer.py
 import re
 
+# Compiled once at import; the normalizer runs for every MFA chunk of every file.
+_PARENTHETICAL_RE = re.compile(r'\([^)]*\)')
+
+class _MfaCharTable(dict):
+    """
+    A str.translate table that uppercases a character and keeps only what survives as
+    A-Z, apostrophes and whitespace. Entries are computed on first use from the
+    character's own str.upper(), so expansions such as 'ß' -> 'SS' behave exactly as
+    uppercasing the whole text and then filtering it would.
+    """
+    def __missing__(self, codepoint: int):
+        kept = ''.join(c for c in chr(codepoint).upper() if 'A' <= c <= 'Z' or c == "'" or c.isspace())
+        self[codepoint] = kept or None
+        return self[codepoint]
+
+_MFA_CHAR_TABLE = _MfaCharTable()
+
 def normalize_text_for_mfa(text: str) -> str:
     """
     Normalizes a text string to be compatible with the Montreal Forced Aligner.
@@ -18,15 +35,10 @@ def normalize_text_for_mfa(text: str) -> str:
         A cleaned, MFA-compatible version of the text.
     """
     # --- MODIFICATION: Remove any parenthetical content ---
-    text = re.sub(r'\([^)]*\)', '', text)
+    text = _PARENTHETICAL_RE.sub('', text)
 
-    # Convert to uppercase
-    text = text.upper()
-    
-    # Remove punctuation except for apostrophes
-    text = re.sub(r"[^A-Z'\s]", '', text)
+    # Convert to uppercase and remove punctuation except for apostrophes, in one pass
+    text = text.translate(_MFA_CHAR_TABLE)
     
     # Replace multiple whitespace characters with a single space
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    return text
+    return ' '.join(text.split())
@@ -1,22 +1,73 @@
 # src/vad_processor.py
+import subprocess
+import tempfile
 import numpy as np
 from pathlib import Path
 from pydub import AudioSegment
+import soundfile as sf
+import soxr
 import pandas as pd
 
 SAMPLE_RATE = 16000
+# Part of the VAD cache key. Bump it whenever process_audio returns different
+# timestamps for the same audio, so cached results from older versions are recomputed.
+# 2: sample indices are floored to ms with integer arithmetic.
+VAD_OUTPUT_VERSION = '2'
 
-def process_audio(audio_path: Path, model, get_speech_timestamps) -> pd.DataFrame:
-    """Processes a single audio file to detect speech segments and returns them as a DataFrame."""
+def _load_with_soundfile(audio_path: Path) -> np.ndarray:
+    """
+    Decodes the file in-process with libsndfile to 16 kHz mono float32.
+    Returns None when libsndfile cannot read the format.
+    """
     try:
-        audio = AudioSegment.from_file(audio_path)
-        if audio.frame_rate != SAMPLE_RATE:
-            audio = audio.set_frame_rate(SAMPLE_RATE)
-        if audio.channels > 1:
-            audio = audio.set_channels(1)
-        audio = audio.set_sample_width(2)
-        raw_samples = np.array(audio.get_array_of_samples(), dtype=np.int16)
-        audio_float32 = raw_samples.astype(np.float32) / 32768.0
+        samples, sr = sf.read(str(audio_path), dtype='float32', always_2d=True)
+    except RuntimeError:
+        return None
+    return _to_model_input(samples, sr)
+
+def _to_model_input(samples: np.ndarray, sr: int) -> np.ndarray:
+    """Downmixes float32 samples shaped (frames, channels) and resamples them to 16 kHz."""
+    mono = samples.mean(axis=1, dtype=np.float32) if samples.shape[1] > 1 else samples[:, 0]
+    if sr != SAMPLE_RATE:
+        mono = soxr.resample(mono, sr, SAMPLE_RATE)
+    return np.ascontiguousarray(mono, dtype=np.float32)
+
+def _load_with_ffmpeg(audio_path: Path) -> np.ndarray:
+    """
+    Decodes formats libsndfile can't read by piping ffmpeg's 16 kHz mono float32 output
+    straight into one buffer, so resampling and downmixing happen inside ffmpeg and no
+    intermediate WAV or AudioSegment is built.
+    """
+    command = [AudioSegment.converter, '-nostdin', '-v', 'error', '-i', str(audio_path),
+               '-f', 'f32le', '-ac', '1', '-ar', str(SAMPLE_RATE), '-']
+    samples = bytearray()
+    with tempfile.TemporaryFile() as stderr_file:
+        with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file) as process:
+            while chunk := process.stdout.read(1 << 20):
+                samples += chunk
+        if process.returncode != 0:
+            stderr_file.seek(0)
+            raise RuntimeError(f"ffmpeg exited with code {process.returncode}: {stderr_file.read().decode('utf-8', 'replace').strip()}")
+    # The bytearray is writable, so the array is a view of it rather than a copy.
+    return np.frombuffer(samples, dtype='<f4')
+
+def process_audio(audio_path: Path, model, get_speech_timestamps, pcm: np.ndarray = None, sr: int = None) -> pd.DataFrame:
+    """
+    Processes a single audio file to detect speech segments and returns them as a DataFrame.
+
+    A caller that has already decoded the file passes its int16 samples, shaped
+    (frames, channels), as `pcm` with their rate `sr`, so the file is not decoded
+    again. Otherwise the file is decoded with soundfile, falling back to an ffmpeg
+    pipe for formats libsndfile can't read.
+    """
+    try:
+        if pcm is not None:
+            # Scaling by 1/32768 gives the same floats libsndfile returns for 16-bit audio.
+            audio_float32 = _to_model_input(np.multiply(pcm, np.float32(1.0 / 32768.0), dtype=np.float32), sr)
+        else:
+            audio_float32 = _load_with_soundfile(audio_path)
+            if audio_float32 is None:
+                audio_float32 = _load_with_ffmpeg(audio_path)
     except Exception as e:
         raise RuntimeError(f"Error loading or preprocessing audio file {audio_path.name}: {e}")
 
@@ -28,8 +79,9 @@ def process_audio(audio_path: Path, model, get_speech_timestamps) -> pd.DataFram
     if not speech_timestamps:
         return pd.DataFrame(columns=['start_ms', 'end_ms'])
     
-    df = pd.DataFrame(speech_timestamps)
-    df['start_ms'] = (df['start'] / SAMPLE_RATE * 1000).astype(int)
-    df['end_ms'] = (df['end'] / SAMPLE_RATE * 1000).astype(int)
-    
-    return df[['start_ms', 'end_ms']]
+    # Sample indices are integers, so convert with an exact floor instead of a float
+    # round-trip (which truncates e.g. sample 16016 to 1000 ms rather than 1001 ms).
+    count = len(speech_timestamps)
+    starts = np.fromiter((ts['start'] for ts in speech_timestamps), dtype=np.int64, count=count)
+    ends = np.fromiter((ts['end'] for ts in speech_timestamps), dtype=np.int64, count=count)
+    return pd.DataFrame({'start_ms': starts * 1000 // SAMPLE_RATE, 'end_ms': ends * 1000 // SAMPLE_RATE})
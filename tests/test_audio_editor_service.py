@@ -0,0 +1,33 @@
+import io
+import random
+
+import numpy as np
+from pydub import AudioSegment
+
+from src.services.audio_editor_service import AudioEditorService
+from src.services.dataset_generator_service import _write_wav
+
+
+def test_direct_cut_matches_pydub_slicing():
+    # 44.1 kHz clips aren't a whole number of frames per ms, so the tail's ms-rounded
+    # length and pydub's silence padding both come into play.
+    editor = AudioEditorService({'editing': {}})
+    rng, r = np.random.default_rng(0), random.Random(0)
+    sr = 44100
+    for _ in range(200):
+        pcm = rng.integers(-3000, 3000, (r.randint(4410, 44100), 1)).astype(np.int16)
+        full = AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=sr, channels=1)
+        clip_start_ms = r.randint(0, len(full) - 20)
+        clip_end_ms = r.randint(clip_start_ms + 20, len(full) + 2)
+        clip = full[clip_start_ms:clip_end_ms]
+        cut_start_s = r.randint(0, len(clip) - 1) / 1000
+        cut_end_s = r.randint(int(cut_start_s * 1000) + 1, len(clip)) / 1000
+
+        frame_ranges = editor._perform_direct_cut(
+            editor._slice_frames(pcm, sr, clip_start_ms, clip_end_ms), sr,
+            cut_start_s, cut_end_s, len(pcm))
+        written = io.BytesIO()
+        _write_wav(pcm, sr, frame_ranges, written)
+
+        expected = clip[:int(cut_start_s * 1000)] + clip[int(cut_end_s * 1000):]
+        assert written.getvalue()[44:] == expected.raw_data
@@ -0,0 +1,21 @@
+import numpy as np
+
+from src.services.cut_parser_service import CutParserService, _sync_tokens, _TOKEN_WORD
+
+
+def _words(count):
+    return [{'id': i, 'type': 'word', 'text': f'w{i}'} for i in range(count)]
+
+
+def test_reply_shorter_than_transcript_does_not_overflow_events():
+    # Every original word mismatches and is skipped, recording two events per word.
+    # The interpreted loop is bounds-checked, unlike the compiled one.
+    codes = np.arange(20, dtype=np.int64)
+    is_word = np.ones(20, dtype=np.bool_)
+    _, _, events = _sync_tokens.py_func(np.array([_TOKEN_WORD]), np.array([-2]), codes, is_word)
+    assert len(events) == 40
+    assert CutParserService().run(_words(20), 'zzz') == []
+
+
+def test_reply_missing_words_still_finds_cut():
+    assert CutParserService().run(_words(6), 'w0 <cut> w1 w2 </cut> w5') == [[1, 2]]
@@ -0,0 +1,44 @@
+import wave
+
+import numpy as np
+import pandas as pd
+
+from src.services.audio_editor_service import AudioEditorService
+from src.services.dataset_generator_service import DatasetGeneratorService
+
+SR = 16000
+
+
+def _edit(cut_word_ids):
+    # Alternating signs put a zero crossing at every sample, so cut bounds aren't moved.
+    # 16008 frames round to a 1000 ms file, the same length as the last word's end.
+    pcm = np.where(np.arange(16008) % 2, -1000, 1000).astype(np.int16)[:, None]
+    mfa = [
+        {'id': 0, 'word': 'a', 'start': 0.0, 'end': 0.25, 'phonemes': []},
+        {'id': 1, 'word': 'b', 'start': 0.25, 'end': 0.5, 'phonemes': []},
+        {'id': 2, 'word': 'c', 'start': 0.5, 'end': 1.0, 'phonemes': []},
+    ]
+    editor = AudioEditorService({'editing': {'cut_workers': 1}})
+    return editor.run(cut_word_ids, pcm, SR, mfa, pd.DataFrame({'split_point_ms': []}))
+
+
+def _save(tmp_path, cut_word_ids):
+    words = [{'id': i, 'text': t, 'type': 'word'} for i, t in enumerate('abc')]
+    DatasetGeneratorService({'output_dataset_path': str(tmp_path)}).run(
+        source_audio_name='src', cut_id=0, cut_word_ids=cut_word_ids, chunk_words=words,
+        edit_results=_edit(cut_word_ids), is_usable=True)
+    with wave.open(str(tmp_path / 'src' / 'cut_0' / 'natural_cut.wav'), 'rb') as f:
+        return f.getnframes()
+
+
+def test_cutting_first_word_leaves_empty_head(tmp_path):
+    assert _edit([0])['natural_cut_audio'][0][1] == 0
+    # The natural cut removes [0, 0.25) s of the whole-file chunk.
+    assert _save(tmp_path, [0]) == 12000
+
+
+def test_cutting_last_word_leaves_empty_tail(tmp_path):
+    head, tail = _edit([2])['natural_cut_audio']
+    assert tail[0] == tail[1]
+    # The natural cut removes [0.5, 1.0) s of the whole-file chunk.
+    assert _save(tmp_path, [2]) == 8000